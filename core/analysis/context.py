@@ -0,0 +1,57 @@
+import ast
+import io
+import tokenize
+from functools import cached_property
+from typing import List, Optional
+
+
+class AnalysisContext:
+    """
+    One file's source plus everything derived from it, computed at most once.
+
+    The file is read once; lines, tokens and the AST are built the first
+    time a check asks for them and shared by every later check, so passing
+    one context through validation, parsing and metrics avoids re-reading
+    and re-tokenizing the same file.
+    """
+
+    def __init__(self, source: str, file_path: Optional[str] = None):
+        self.source = source
+        self.file_path = file_path
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "AnalysisContext":
+        with open(file_path, "r") as f:
+            return cls(f.read(), file_path)
+
+    @property
+    def filename(self) -> str:
+        return self.file_path or "<uploaded>"
+
+    # Lines with their endings, as readlines() would return them
+    @cached_property
+    def lines(self) -> List[str]:
+        return io.StringIO(self.source).readlines()
+
+    @cached_property
+    def tokens(self) -> List[tokenize.TokenInfo]:
+        return list(tokenize.generate_tokens(iter(self.lines).__next__))
+
+    @cached_property
+    def _parsed(self):
+        try:
+            return ast.parse(self.source, filename=self.filename), None
+        except (SyntaxError, ValueError) as e:
+            return None, e
+
+    @property
+    def tree(self) -> ast.Module:
+        """The module AST; raises the original error if the source does not parse."""
+        tree, error = self._parsed
+        if error is not None:
+            raise error
+        return tree
+
+    @property
+    def parse_error(self) -> Optional[Exception]:
+        return self._parsed[1]
@@ -0,0 +1,142 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+# ---------------- SQLite Key/Value Cache ----------------
+
+# Flush recency updates / check the size bound every N operations
+_TOUCH_BATCH = 256
+_TRIM_INTERVAL = 256
+
+
+class SQLiteCache:
+    """
+    Bounded, persistent key/value cache stored in a SQLite file.
+
+    Values are stored as JSON. When the number of entries goes over
+    `max_entries`, the least recently used ones are evicted; with a `ttl`
+    (seconds), entries written longer ago than that read as misses and
+    are dropped on the next trim. The database runs in WAL mode with a
+    busy timeout, so several processes can read and write the same cache
+    file at once.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200_000, timeout: float = 30.0,
+                 ttl: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._touched = {}
+        self._puts = 0
+
+        self._conn = sqlite3.connect(path, timeout=timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn.execute(
+            "SELECT value, created FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or self._expired(row[1]):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= _TOUCH_BATCH:
+            self._flush_touches()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, last_used, created) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+        self._puts += 1
+        if self._puts % _TRIM_INTERVAL == 0:
+            self.trim()
+
+    def trim(self) -> int:
+        """Evict expired entries, then least recently used ones beyond max_entries."""
+        self._flush_touches()
+        with self._conn:
+            expired = 0
+            if self.ttl is not None:
+                expired = self._conn.execute(
+                    "DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)
+                ).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            excess = count - self.max_entries
+            if excess <= 0:
+                return expired
+            self._conn.execute("""
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY last_used LIMIT ?
+                )
+            """, (excess,))
+        return expired + excess
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0,
+            "entries": entries,
+        }
+
+    def clear(self) -> None:
+        self._touched.clear()
+        with self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        self.trim()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and created < time.time() - self.ttl
+
+    # Write pending recency updates in one transaction
+    def _flush_touches(self) -> None:
+        if not self._touched:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+        self._touched.clear()
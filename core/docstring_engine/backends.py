@@ -0,0 +1,181 @@
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    from llama_cpp import Llama
+except ImportError:  # optional: only needed for the local backend
+    Llama = None
+
+GROQ_MODEL = "llama-3.3-70b-versatile"
+
+# ---------------- Backends ----------------
+
+class LLMBackend(ABC):
+    """
+    Something the docstring engine can send a prompt to.
+
+    complete_json(prompt) returns the model's answer as JSON text.
+    `model` names the model; it is part of the response cache key, so
+    answers from different models never mix.
+    """
+
+    name = "base"
+    model = ""
+
+    @abstractmethod
+    def complete_json(self, prompt: str) -> str:
+        """The model's answer to `prompt`, as JSON text."""
+
+
+class GroqBackend(LLMBackend):
+    """Groq chat completions in JSON mode."""
+
+    name = "groq"
+
+    def __init__(self, client, model: str = GROQ_MODEL):
+        self.client = client
+        self.model = model
+
+    def complete_json(self, prompt: str) -> str:
+        res = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"} # FORCES GROQ TO RETURN JSON
+        )
+        return res.choices[0].message.content
+
+
+class LocalModelPool:
+    """
+    Loaded llama.cpp models for one GGUF file.
+
+    A llama.cpp model serves one completion at a time, so callers borrow
+    a model and wait in line when all `replicas` are busy. Models are
+    loaded on first use and then stay loaded for the life of the process.
+    """
+
+    def __init__(self, model_path: str, replicas: int = 1, **params):
+        if Llama is None:
+            raise ImportError("The local backend needs llama-cpp-python (pip install llama-cpp-python)")
+        if replicas < 1:
+            raise ValueError("replicas must be at least 1")
+        self.model_path = model_path
+        self.replicas = replicas
+        self.params = params
+        self.loaded = 0
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def model(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        try:
+            llm = self._idle.get_nowait()
+        except queue.Empty:
+            llm = self._load_or_wait(timeout)
+        try:
+            yield llm
+        finally:
+            self._idle.put(llm)
+
+    def warm(self) -> None:
+        """Load the first model now rather than on the first request."""
+        with self.model():
+            pass
+
+    def _load_or_wait(self, timeout: Optional[float]) -> Any:
+        with self._lock:
+            load = self.loaded < self.replicas
+            if load:
+                self.loaded += 1
+        if not load:
+            try:
+                return self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No local model free after {timeout} seconds") from None
+        try:
+            return Llama(model_path=self.model_path, verbose=False, **self.params)
+        except Exception:
+            with self._lock:
+                self.loaded -= 1
+            raise
+
+
+# Identity of a model file for the response cache: its absolute path, plus
+# size and mtime when it exists, so different files (or a replaced file)
+# with the same name never share cached answers
+def _model_id(model_path: str) -> str:
+    path = os.path.abspath(model_path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path
+    return f"{path}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+_pools: Dict[Tuple, LocalModelPool] = {}
+_pools_lock = threading.Lock()
+
+def shared_model_pool(model_path: str, n_threads: Optional[int] = None, n_ctx: int = 8192,
+                      n_gpu_layers: int = 0, replicas: int = 1) -> LocalModelPool:
+    """
+    The process-wide pool for a model file and load settings.
+
+    Every backend (and every Streamlit session) asking for the same model
+    shares one pool, so the model is loaded once and kept warm. The first
+    caller's `replicas` sets the pool's size.
+    """
+    n_threads = n_threads or os.cpu_count() or 1
+    key = (os.path.abspath(model_path), n_threads, n_ctx, n_gpu_layers)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = LocalModelPool(model_path, replicas, n_threads=n_threads, n_ctx=n_ctx,
+                                         n_gpu_layers=n_gpu_layers)
+        return _pools[key]
+
+
+class LlamaCppBackend(LLMBackend):
+    """
+    A local GGUF model run with llama-cpp-python, for machines without
+    API access. Requests are queued to the shared model pool.
+    """
+
+    name = "llama_cpp"
+
+    def __init__(self, model_path: str, n_threads: Optional[int] = None, n_ctx: int = 8192,
+                 n_gpu_layers: int = 0, max_concurrency: int = 1, temperature: float = 0.3,
+                 timeout: Optional[float] = None):
+        self.model = _model_id(model_path)
+        self.temperature = temperature
+        self.timeout = timeout
+        self.pool = shared_model_pool(model_path, n_threads, n_ctx, n_gpu_layers, max_concurrency)
+
+    @classmethod
+    def from_env(cls) -> "LlamaCppBackend":
+        """
+        Settings from LLAMA_MODEL_PATH, LLAMA_N_THREADS (default: all
+        cores), LLAMA_N_CTX, LLAMA_N_GPU_LAYERS and LLAMA_MAX_CONCURRENCY.
+        """
+        model_path = os.getenv("LLAMA_MODEL_PATH")
+        if not model_path:
+            raise ValueError("LLAMA_MODEL_PATH is not set")
+        n_threads = os.getenv("LLAMA_N_THREADS")
+        return cls(
+            model_path,
+            n_threads=int(n_threads) if n_threads else None,
+            n_ctx=int(os.getenv("LLAMA_N_CTX", "8192")),
+            n_gpu_layers=int(os.getenv("LLAMA_N_GPU_LAYERS", "0")),
+            max_concurrency=int(os.getenv("LLAMA_MAX_CONCURRENCY", "1")),
+        )
+
+    def complete_json(self, prompt: str) -> str:
+        with self.pool.model(self.timeout) as llm:
+            res = llm.create_chat_completion(
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                temperature=self.temperature,
+            )
+        return res["choices"][0]["message"]["content"]
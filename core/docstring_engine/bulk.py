@@ -0,0 +1,337 @@
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from groq import APIConnectionError, Groq, InternalServerError, RateLimitError
+
+from core.docstring_engine import groq_integration
+from core.docstring_engine.backends import LLMBackend
+from core.docstring_engine.llm_cache import LLMCache
+from core.parser.records import FunctionRecord, function_keys, to_dicts
+
+# Rough size of one answer, added to the prompt's estimate for the token budget
+COMPLETION_TOKENS = 400
+_WINDOW = 60.0
+
+# ---------------- Budgets ----------------
+
+def estimate_tokens(prompt: str, answers: int = 1) -> int:
+    """About four characters per token, plus room for the answers."""
+    return len(prompt) // 4 + COMPLETION_TOKENS * answers
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget over a sliding
+    60 second window, shared by every worker thread.
+
+    acquire() blocks until the request fits both budgets. pause() holds
+    every caller back, e.g. for the Retry-After of a 429 response.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._sent = deque()  # (time, tokens)
+        self._tokens = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    # Seconds to wait before `tokens` fit, 0 if they fit now
+    def _wait(self, now: float, tokens: int) -> float:
+        while self._sent and self._sent[0][0] <= now - _WINDOW:
+            self._tokens -= self._sent.popleft()[1]
+        wait = max(self._paused_until - now, 0.0)
+        if self.rpm is not None and len(self._sent) >= self.rpm:
+            wait = max(wait, self._sent[len(self._sent) - self.rpm][0] + _WINDOW - now)
+        if self.tpm is not None and self._sent and self._tokens + tokens > self.tpm:
+            # Oldest requests have to leave the window until the new one fits
+            freed = self._tokens + tokens - self.tpm
+            for sent_at, sent_tokens in self._sent:
+                freed -= sent_tokens
+                if freed <= 0:
+                    break
+            wait = max(wait, sent_at + _WINDOW - now)
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = self._wait(now, tokens)
+                if wait <= 0:
+                    self._sent.append((now, tokens))
+                    self._tokens += tokens
+                    return
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class AdaptiveConcurrency:
+    """
+    Bound on requests in flight, adjusted AIMD style: each success adds
+    1/limit (about one slot per round of requests), each 429 halves the
+    limit. Throttles from requests started before the last cut are
+    ignored, so one burst of 429s only halves it once.
+    """
+
+    def __init__(self, initial: int = 4, maximum: int = 16, minimum: int = 1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self._epoch = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> int:
+        """Wait for a free slot; returns the epoch to pass to throttled()."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            return self._epoch
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def succeeded(self) -> None:
+        with self._cond:
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+            self._cond.notify_all()
+
+    def throttled(self, epoch: int) -> None:
+        with self._cond:
+            if epoch == self._epoch:
+                self.limit = max(self.limit / 2, self.minimum)
+                self._epoch += 1
+
+
+# ---------------- Bulk Generation ----------------
+
+def _retry_after(error: Exception, attempt: int) -> float:
+    response = getattr(error, "response", None)
+    try:
+        return max(float(response.headers.get("retry-after")), 0.0)
+    except (AttributeError, TypeError, ValueError):
+        return min(2.0 ** attempt, 60.0)
+
+def pack_batches(items: Iterable[Tuple[str, Dict[str, Any]]], max_tokens: int,
+                 max_functions: int = 20) -> List[List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Greedily packs (key, fn_info) pairs into batches whose prompt and
+    expected answers fit `max_tokens`. A function too big for the budget
+    gets a batch of its own.
+    """
+    overhead = estimate_tokens(groq_integration.build_batch_prompt([]), answers=0)
+    batches, batch, used = [], [], overhead
+    for key, fn_info in items:
+        cost = estimate_tokens(f"[f{len(batch)}]\n" + groq_integration.describe_function(fn_info))
+        if batch and (used + cost > max_tokens or len(batch) >= max_functions):
+            batches.append(batch)
+            batch, used = [], overhead
+        batch.append((key, fn_info))
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class BulkGenerator:
+    """
+    Generates docstrings for many functions concurrently.
+
+    Requests run on a thread pool of `max_concurrency` workers, but only
+    as many are in flight as the adaptive limit allows, and each one
+    takes its share of the RPM/TPM budget right before it is sent. A 429
+    pauses everyone for its Retry-After, halves the concurrency and
+    retries the function (up to `max_attempts` tries). Cache lookups and stores happen on the
+    calling thread, since SQLite connections cannot cross threads.
+
+    With `batch_tokens`, up to `batch_size` functions are packed into
+    each request under that token budget. Functions a batch fails to
+    answer, or the whole batch if it fails, are asked for one by one.
+
+    Requests go to `backend`, or to Groq through `llm_client`, or to the
+    backend configured for the engine (see groq_integration.get_backend).
+    """
+
+    def __init__(self, llm_client: Optional[Groq] = None, styles: Iterable[str] = groq_integration.STYLES,
+                 rpm: Optional[int] = 30, tpm: Optional[int] = 12_000, max_concurrency: int = 8,
+                 initial_concurrency: int = 2, max_attempts: int = 5, cache: Optional[LLMCache] = None,
+                 batch_tokens: Optional[int] = None, batch_size: int = 20, backend: Optional[LLMBackend] = None):
+        self.backend = groq_integration.get_backend(llm_client, backend)
+        self.styles = tuple(styles)
+        self.max_attempts = max_attempts
+        self.cache = cache
+        self.batch_tokens = batch_tokens
+        self.batch_size = batch_size
+        self.limiter = RateLimiter(rpm, tpm)
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, maximum=max_concurrency)
+        self.stats = {"functions": 0, "cached": 0, "requests": 0, "batches": 0, "fallbacks": 0,
+                      "throttled": 0, "errors": 0, "seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    # One request's answer, retried on rate limits and transient errors
+    def _request(self, send: Callable[[], Any], tokens: int) -> Any:
+        for attempt in range(1, self.max_attempts + 1):
+            # Take a slot first, so time spent queued for it is not counted
+            # as a send in the RPM/TPM window
+            epoch = self.concurrency.acquire()
+            try:
+                self.limiter.acquire(tokens)
+                self._count("requests")
+                answer = send()
+            except RateLimitError as e:
+                self._count("throttled")
+                self.concurrency.throttled(epoch)
+                self.limiter.pause(_retry_after(e, attempt))
+                error = e
+            except (APIConnectionError, InternalServerError) as e:
+                self.limiter.pause(_retry_after(e, attempt))
+                error = e
+            else:
+                self.concurrency.succeeded()
+                return answer
+            finally:
+                self.concurrency.release()
+        raise error
+
+    def _fetch(self, fn_info: Dict[str, Any]) -> Dict[str, Any]:
+        return self._request(
+            lambda: groq_integration.fetch_docstring_content(fn_info, backend=self.backend),
+            estimate_tokens(groq_integration.build_prompt(fn_info))
+        )
+
+    # {key: content or the exception} for one batch of (key, fn_info) pairs
+    def _fetch_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        contents = {}
+        if len(batch) > 1:
+            fn_infos = [fn_info for _, fn_info in batch]
+            self._count("batches")
+            try:
+                contents = self._request(
+                    lambda: groq_integration.fetch_docstring_batch(fn_infos, backend=self.backend),
+                    estimate_tokens(groq_integration.build_batch_prompt(fn_infos), answers=len(fn_infos))
+                )
+            except Exception:
+                pass
+
+        results = {}
+        for i, (key, fn_info) in enumerate(batch):
+            if i in contents:
+                results[key] = contents[i]
+                continue
+            if len(batch) > 1:
+                self._count("fallbacks")
+            try:
+                results[key] = self._fetch(fn_info)
+            except Exception as e:
+                results[key] = e
+        return results
+
+    def run(self, functions: Iterable[Union[FunctionRecord, Dict[str, Any]]],
+            on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Docstrings for every undocumented function in parse_path output.
+
+        Returns {function key: {"name", "docstrings": {style: text},
+        "cached"}} keyed like function_keys; failures get "error" instead
+        of "docstrings". on_result(key, result) is called as each
+        function finishes.
+        """
+        start = time.perf_counter()
+        records = to_dicts(functions)
+        pending = {
+            key: groq_integration.fn_info_of(fn) for key, fn in zip(function_keys(records), records) if not fn.get("docstring")
+        }
+        self.stats["functions"] += len(pending)
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def render(key, content):
+            return {style: groq_integration.render_docstring(pending[key], content, style) for style in self.styles}
+
+        def finish(key, docstrings=None, error=None, cached=False):
+            result = {"name": pending[key]["name"], "cached": cached}
+            if error is not None:
+                self.stats["errors"] += 1
+                result["error"] = str(error)
+            else:
+                result["docstrings"] = docstrings
+            results[key] = result
+            if on_result is not None:
+                on_result(key, result)
+
+        to_fetch = []
+        for key, fn_info in pending.items():
+            content = self.cache.lookup(fn_info, self.backend.model, groq_integration.PROMPT_VERSION) \
+                if self.cache is not None else None
+            try:
+                docstrings = render(key, content) if content is not None else None
+            except Exception:
+                docstrings = None  # unusable cache entry: ask again
+            if docstrings is None:
+                to_fetch.append(key)
+            else:
+                self.stats["cached"] += 1
+                finish(key, docstrings, cached=True)
+
+        items = [(key, pending[key]) for key in to_fetch]
+        if self.batch_tokens:
+            batches = pack_batches(items, self.batch_tokens, self.batch_size)
+        else:
+            batches = [[item] for item in items]
+
+        if batches:
+            workers = min(self.concurrency.maximum, len(batches))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="docstring") as pool:
+                futures = [pool.submit(self._fetch_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    for key, content in future.result().items():
+                        if isinstance(content, Exception):
+                            finish(key, error=content)
+                            continue
+                        # A bad answer fails only its own function, and is not cached
+                        try:
+                            docstrings = render(key, content)
+                        except Exception as e:
+                            finish(key, error=e)
+                            continue
+                        if self.cache is not None:
+                            self.cache.store(pending[key], self.backend.model, groq_integration.PROMPT_VERSION,
+                                             content)
+                        finish(key, docstrings)
+
+        self.stats["seconds"] += time.perf_counter() - start
+        return {key: results[key] for key in pending}
+
+
+def generate_missing_docstrings(functions: Iterable[Union[FunctionRecord, Dict[str, Any]]],
+                                **options) -> Dict[str, Dict[str, Any]]:
+    """BulkGenerator(**options).run(functions)"""
+    return BulkGenerator(**options).run(functions)
+
+
+# ---------------- Example Usage ----------------
+if __name__ == "__main__":
+    from core.parser.python_parser import parse_path
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "examples/sample_a.py"
+    generator = BulkGenerator(cache=LLMCache())
+    generator.run(parse_path(path), on_result=lambda key, r: print(f"{key}: {'error' if 'error' in r else 'ok'}"))
+    print(json.dumps(generator.stats, indent=2))
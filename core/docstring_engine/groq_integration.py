@@ -1,42 +1,167 @@
 # llm_generator.py
 import os
 import json
+import threading
+from typing import Dict, Iterable, Optional, Sequence
+
 import dotenv
 from groq import Groq
-from core.docstring_engine.generator import to_google, to_numpy, to_rest
+from core.docstring_engine import generator
+from core.docstring_engine.backends import GROQ_MODEL, GroqBackend, LLMBackend, LlamaCppBackend
+from core.docstring_engine.llm_cache import LLMCache
 
 dotenv.load_dotenv()
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Without a key (e.g. air-gapped machines on the local backend) the client
+# is created on first use instead, which raises if Groq is really needed
+client = Groq(api_key=os.getenv("GROQ_API_KEY")) if os.getenv("GROQ_API_KEY") else None
+
+MODEL = GROQ_MODEL
+STYLES = ("google", "numpy", "rest")
+# Bump whenever build_prompt changes, so cached answers to the old prompt are not reused
+PROMPT_VERSION = "1"
+
+CONTENT_FIELDS = """summary: str,
+arg_descs: { "arg_name": { "description": str, "inferred_type": str } },
+ret_desc: str,
+ret_type_inferred: str
+"""
 
-def generate_placeholder_docstring(fn_info: dict, style: str) -> str:
+def fn_info_of(fn) -> dict:
     """
-    Generates docstring using LLM + formatter.
-    Returns formatted docstring text (NOT triple quotes).
+    The prompt's view of a function record (a parse_path dict or a
+    FunctionRecord): name, return annotation and {name, annotation} per
+    argument. Every caller builds it here, so equal signatures share
+    LLMCache entries.
     """
-    prompt = f"""
-Analyze this Python function:
-Name: {fn_info['name']}
+    if not isinstance(fn, dict):
+        fn = fn.to_dict()
+    args = [{"name": arg["name"], "annotation": arg.get("annotation")} for arg in fn.get("args") or ()]
+    return {"name": fn["name"], "args": args, "returns": fn.get("returns")}
+
+def describe_function(fn_info: dict) -> str:
+    return f"""Name: {fn_info['name']}
 Args: {fn_info['args']}
-Returns: {fn_info['returns']}
+Returns: {fn_info.get('returns')}
+"""
 
+def build_prompt(fn_info: dict) -> str:
+    return f"""
+Analyze this Python function:
+{describe_function(fn_info)}
 Return JSON with:
-summary: str,
-arg_descs: {{ "arg_name": {{ "description": str, "inferred_type": str }} }},
-ret_desc: str,
-ret_type_inferred: str
-"""
+{CONTENT_FIELDS}"""
+
+def build_batch_prompt(fn_infos: Sequence[dict]) -> str:
+    functions = "\n".join(f"[f{i}]\n{describe_function(fn)}" for i, fn in enumerate(fn_infos))
+    return f"""
+Analyze these Python functions. Each one starts with its id in brackets.
+{functions}
+Return one JSON object with a key for every id ("f0", "f1", ...).
+Each key maps to a JSON object with:
+{CONTENT_FIELDS}"""
+
+# Content the formatters can render: a summary string and, if present, a dict of arg descriptions
+def _valid_content(content) -> bool:
+    return (
+        isinstance(content, dict)
+        and isinstance(content.get("summary"), str)
+        and isinstance(content.get("arg_descs", {}), dict)
+    )
+
+# ---------------- Backend Selection ----------------
+
+_local_backend = None
+_local_lock = threading.Lock()
 
+def _groq_client() -> Groq:
+    global client
+    if client is None:
+        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    return client
+
+def get_backend(llm_client: Optional[Groq] = None, backend: Optional[LLMBackend] = None) -> LLMBackend:
+    """
+    The backend a call should use: `backend` if given, else Groq with
+    `llm_client`, else the one named by DOCSTRING_BACKEND ("groq" by
+    default, or "llama_cpp", configured by LLAMA_* variables).
+    """
+    global _local_backend
+    if backend is not None:
+        return backend
+    if llm_client is None and os.getenv("DOCSTRING_BACKEND", "groq").lower() == "llama_cpp":
+        with _local_lock:
+            if _local_backend is None:
+                _local_backend = LlamaCppBackend.from_env()
+            return _local_backend
+    return GroqBackend(llm_client or _groq_client(), MODEL)
+
+def fetch_docstring_content(fn_info: dict, cache: Optional[LLMCache] = None,
+                            bypass_cache: bool = False, llm_client: Optional[Groq] = None,
+                            backend: Optional[LLMBackend] = None) -> dict:
+    """
+    Asks the LLM for the structured docstring content of one function.
+    The content is style independent; raises if the call or JSON fails.
+    With a cache, a known signature is answered from it; bypass_cache
+    skips the lookup but still stores the fresh answer. Answers the
+    formatters cannot render raise ValueError and are never cached. `llm_client` or
+    `backend` replace the configured backend for this call.
+    """
+    backend = get_backend(llm_client, backend)
+    if cache is not None and not bypass_cache:
+        content = cache.lookup(fn_info, backend.model, PROMPT_VERSION)
+        if _valid_content(content):
+            return content
+
+    raw = backend.complete_json(build_prompt(fn_info))
+    content = json.loads(raw)
+    if not _valid_content(content):
+        raise ValueError("LLM answer is missing a summary or has malformed arg_descs")
+    if cache is not None:
+        cache.store(fn_info, backend.model, PROMPT_VERSION, content)
+    return content
+
+def fetch_docstring_batch(fn_infos: Sequence[dict], llm_client: Optional[Groq] = None,
+                          backend: Optional[LLMBackend] = None) -> Dict[int, dict]:
+    """
+    Asks the LLM for the docstring content of several functions in one
+    request. Returns {index in fn_infos: content} for the entries the
+    answer got right; callers retry the missing ones on their own.
+    Raises if the call fails or the answer is not JSON.
+    """
+    raw = get_backend(llm_client, backend).complete_json(build_batch_prompt(fn_infos))
+    answer = json.loads(raw)
+    if not isinstance(answer, dict):
+        raise ValueError("Batch answer is not a JSON object")
+    contents = {}
+    for i in range(len(fn_infos)):
+        content = answer.get(f"f{i}")
+        if _valid_content(content):
+            contents[i] = content
+    return contents
+
+def render_docstring(fn_info: dict, content: dict, style: str) -> str:
+    formatters = {"google": generator.to_google, "numpy": generator.to_numpy, "rest": generator.to_rest}
+    return formatters[style.lower()](fn_info, content)
+
+def generate_docstrings(fn_info: dict, styles: Iterable[str] = STYLES, cache: Optional[LLMCache] = None,
+                        bypass_cache: bool = False, backend: Optional[LLMBackend] = None) -> Dict[str, str]:
+    """
+    Generates docstrings in several styles from a single LLM call.
+    Returns {style: formatted docstring text}; every style gets the
+    error text if the call fails.
+    """
+    styles = list(styles)
     try:
-        res = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"} # FORCES GROQ TO RETURN JSON
-        )
-        raw = res.choices[0].message.content
-        content = json.loads(raw)
-
-        formatters = {"google": to_google, "numpy": to_numpy, "rest": to_rest}
-        return formatters[style.lower()](fn_info, content)
+        content = fetch_docstring_content(fn_info, cache, bypass_cache, backend=backend)
+        return {style: render_docstring(fn_info, content, style) for style in styles}
     except Exception as e:
-        return f"Error: {str(e)}"
+        return {style: f"Error: {str(e)}" for style in styles}
+
+def generate_placeholder_docstring(fn_info: dict, style: str, cache: Optional[LLMCache] = None,
+                                   bypass_cache: bool = False, backend: Optional[LLMBackend] = None) -> str:
+    """
+    Generates docstring using LLM + formatter.
+    Returns formatted docstring text (NOT triple quotes).
+    """
+    return generate_docstrings(fn_info, (style,), cache, bypass_cache, backend)[style]
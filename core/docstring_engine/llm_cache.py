@@ -0,0 +1,37 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from core.cache.sqlite_cache import SQLiteCache
+
+DEFAULT_LLM_CACHE_PATH = os.path.join("storage", "cache", "llm_cache.db")
+DEFAULT_TTL = 30 * 24 * 60 * 60
+
+
+class LLMCache(SQLiteCache):
+    """
+    On-disk cache of LLM docstring content keyed by function signature.
+
+    The key is a SHA-256 of the function's name, args and return
+    annotation plus the model name and prompt version, so the same
+    signature is only sent to the model once, and changing the model or
+    bumping the prompt version invalidates old answers. Entries expire
+    after `ttl` seconds (30 days by default).
+    """
+
+    def __init__(self, path: str = DEFAULT_LLM_CACHE_PATH, max_entries: int = 50_000,
+                 ttl: Optional[float] = DEFAULT_TTL):
+        super().__init__(path, max_entries=max_entries, ttl=ttl)
+
+    @staticmethod
+    def key_for(fn_info: Dict[str, Any], model: str, prompt_version: str) -> str:
+        signature = [fn_info.get("name"), fn_info.get("args"), fn_info.get("returns"), model, prompt_version]
+        encoded = json.dumps(signature, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def lookup(self, fn_info: Dict[str, Any], model: str, prompt_version: str) -> Optional[Dict[str, Any]]:
+        return self.get(self.key_for(fn_info, model, prompt_version))
+
+    def store(self, fn_info: Dict[str, Any], model: str, prompt_version: str, content: Dict[str, Any]) -> None:
+        self.put(self.key_for(fn_info, model, prompt_version), content)
@@ -0,0 +1,261 @@
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.parser.python_parser import parse_directory
+from core.parser.records import function_keys, get_docstring, get_name
+from core.parser.symbol_index import module_name
+from core.validator.validator import validate_folder
+
+DEFAULT_HISTORY_PATH = os.path.join("storage", "history", "history.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    root TEXT,
+    label TEXT,
+    total_functions INTEGER NOT NULL DEFAULT 0,
+    functions_with_docstring INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS files (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    file_path TEXT NOT NULL,
+    package TEXT NOT NULL,
+    total_functions INTEGER NOT NULL DEFAULT 0,
+    functions_with_docstring INTEGER NOT NULL DEFAULT 0,
+    parse_error INTEGER NOT NULL DEFAULT 0,
+    pep257_violations INTEGER,
+    formatting_issues INTEGER,
+    PRIMARY KEY (run_id, file_path)
+);
+CREATE TABLE IF NOT EXISTS functions (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    file_path TEXT NOT NULL,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    has_docstring INTEGER NOT NULL,
+    complexity INTEGER,
+    PRIMARY KEY (run_id, file_path, key)
+);
+CREATE TABLE IF NOT EXISTS violations (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    file_path TEXT NOT NULL,
+    code TEXT NOT NULL,
+    line INTEGER,
+    column INTEGER,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_files_file_path ON files(file_path, run_id);
+CREATE INDEX IF NOT EXISTS idx_files_package ON files(package, run_id);
+CREATE INDEX IF NOT EXISTS idx_functions_file_path ON functions(file_path, run_id);
+CREATE INDEX IF NOT EXISTS idx_violations_run ON violations(run_id, file_path);
+CREATE INDEX IF NOT EXISTS idx_violations_file_path ON violations(file_path, run_id);
+"""
+
+_DAY = 24 * 60 * 60
+
+
+# Dotted package a file belongs to ("" for files at the root)
+def package_of(file_path: str, root: Optional[str] = None) -> str:
+    module = module_name(file_path, root)
+    if os.path.basename(file_path) == "__init__.py":
+        return module
+    return module.rpartition(".")[0]
+
+
+class HistoryStore:
+    """
+    Every run's coverage and validation results, kept in SQLite.
+
+    Each run adds one row to `runs` and its per-file, per-function and
+    per-violation rows, written with executemany in a single transaction.
+    Indexes on run id, file path, package and run time keep history
+    queries (such as coverage_by_package) off full table scans.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, timeout: float = 30.0):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=timeout)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    # ---------------- Writing ----------------
+
+    def record_run(self, parse_results: Iterable[Dict[str, Any]] = (),
+                   validation_results: Iterable[Dict[str, Any]] = (),
+                   root: Optional[str] = None, label: Optional[str] = None,
+                   started_at: Optional[float] = None) -> int:
+        """
+        Store one run and return its id.
+
+        `parse_results` are parser results ({"file_path", "functions"}) and
+        `validation_results` are validate_file results; a file may appear
+        in either or both. Functions are keyed by their qualified name
+        (function_keys), so the same function lines up across runs.
+        """
+        files: Dict[str, Dict[str, Any]] = {}
+        functions = []
+        violations = []
+
+        def file_row(file_path):
+            if file_path not in files:
+                files[file_path] = {
+                    "file_path": file_path, "package": package_of(file_path, root),
+                    "total_functions": 0, "functions_with_docstring": 0,
+                    "parse_error": 0, "pep257_violations": None, "formatting_issues": None,
+                }
+            return files[file_path]
+
+        for result in parse_results:
+            row = file_row(result.get("file_path", "unknown"))
+            if "error" in result:
+                row["parse_error"] = 1
+            records = list(result.get("functions") or ())
+            for key, fn in zip(function_keys(records), records):
+                documented = 1 if get_docstring(fn) else 0
+                complexity = fn.get("complexity") if isinstance(fn, dict) else getattr(fn, "complexity", None)
+                functions.append((row["file_path"], key, get_name(fn), documented, complexity))
+                row["total_functions"] += 1
+                row["functions_with_docstring"] += documented
+
+        for result in validation_results:
+            row = file_row(result.get("file", "unknown"))
+            if result.get("parse_error"):
+                row["parse_error"] = 1
+            row["pep257_violations"] = result.get("pep257_violations")
+            row["formatting_issues"] = result.get("formatting_issues")
+            for v in result.get("formatting_violations", ()):
+                violations.append((row["file_path"], v["code"], v.get("line"), v.get("column"), v.get("message")))
+
+        total = sum(r["total_functions"] for r in files.values())
+        documented = sum(r["functions_with_docstring"] for r in files.values())
+        with self._conn:
+            run_id = self._conn.execute(
+                "INSERT INTO runs (started_at, root, label, total_functions, functions_with_docstring) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (time.time() if started_at is None else started_at, root, label, total, documented)
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO files (run_id, file_path, package, total_functions, functions_with_docstring, "
+                "parse_error, pep257_violations, formatting_issues) "
+                "VALUES (:run_id, :file_path, :package, :total_functions, :functions_with_docstring, "
+                ":parse_error, :pep257_violations, :formatting_issues)",
+                (dict(row, run_id=run_id) for row in files.values())
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO functions (run_id, file_path, key, name, has_docstring, complexity) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_id,) + fn for fn in functions)
+            )
+            self._conn.executemany(
+                "INSERT INTO violations (run_id, file_path, code, line, column, message) VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_id,) + v for v in violations)
+            )
+        return run_id
+
+    def delete_runs_before(self, timestamp: float) -> int:
+        """Drop runs (and their rows) that started before `timestamp`."""
+        with self._conn:
+            return self._conn.execute("DELETE FROM runs WHERE started_at < ?", (timestamp,)).rowcount
+
+    # ---------------- Reading ----------------
+
+    def runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent runs first."""
+        sql = "SELECT * FROM runs ORDER BY started_at DESC, id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self._conn.execute(sql)]
+
+    def run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def latest_run_id(self) -> Optional[int]:
+        row = self._conn.execute("SELECT id FROM runs ORDER BY started_at DESC, id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def run_files(self, run_id: int) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._conn.execute(
+            "SELECT * FROM files WHERE run_id = ? ORDER BY file_path", (run_id,)
+        )]
+
+    def run_functions(self, run_id: int) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._conn.execute(
+            "SELECT file_path, key, name, has_docstring, complexity FROM functions WHERE run_id = ?", (run_id,)
+        )]
+
+    def run_violations(self, run_id: int) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._conn.execute(
+            "SELECT file_path, code, line, column, message FROM violations WHERE run_id = ?", (run_id,)
+        )]
+
+    def file_history(self, file_path: str, days: Optional[float] = None) -> List[Dict[str, Any]]:
+        """One file's rows across runs, oldest first."""
+        since = 0 if days is None else time.time() - days * _DAY
+        return [dict(row) for row in self._conn.execute(
+            "SELECT r.started_at, f.* FROM files f JOIN runs r ON r.id = f.run_id "
+            "WHERE f.file_path = ? AND r.started_at >= ? ORDER BY r.started_at",
+            (file_path, since)
+        )]
+
+    def coverage_by_package(self, days: float = 90, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Docstring coverage per package for every run of the last `days`
+        days, oldest first: [{"run_id", "started_at", "package",
+        "total_functions", "functions_with_docstring", "coverage_percent"}].
+        """
+        since = (time.time() if now is None else now) - days * _DAY
+        rows = self._conn.execute("""
+            SELECT r.id AS run_id, r.started_at, f.package,
+                   SUM(f.total_functions) AS total_functions,
+                   SUM(f.functions_with_docstring) AS functions_with_docstring
+            FROM runs r JOIN files f ON f.run_id = r.id
+            WHERE r.started_at >= ?
+            GROUP BY r.id, f.package
+            ORDER BY r.started_at, f.package
+        """, (since,))
+        report = []
+        for row in rows:
+            entry = dict(row)
+            total = entry["total_functions"]
+            entry["coverage_percent"] = round(entry["functions_with_docstring"] / total * 100, 2) if total else 0
+            report.append(entry)
+        return report
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Parse and validate a folder, then store the results as one run
+def record_directory(store: HistoryStore, root: str, label: Optional[str] = None) -> int:
+    parsed = parse_directory(root)
+    validated = validate_folder(root, recursive=True)
+    return store.record_run(parsed, validated, root=root, label=label)
+
+
+# ---------------- Example Usage ----------------
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else "examples"
+    with HistoryStore() as store:
+        run_id = record_directory(store, folder)
+        print(f"Recorded run {run_id} for {folder}")
+        for row in store.coverage_by_package():
+            print(f"{row['started_at']:.0f}  {row['package'] or '(root)'}: {row['coverage_percent']}%")
@@ -0,0 +1,99 @@
+from typing import Any, Dict, List
+
+from radon.metrics import h_visit_ast, mi_compute
+from radon.raw import analyze
+from radon.visitors import ComplexityVisitor, Function
+
+from core.analysis.context import AnalysisContext
+
+# ---------------- Labels ----------------
+
+def risk_level(max_complexity: int) -> str:
+    return "Low" if max_complexity <= 5 else "Medium" if max_complexity <= 10 else "High"
+
+def mi_status(score: float) -> str:
+    return "Good" if score >= 70 else "Average" if score >= 50 else "Poor"
+
+
+# ---------------- Sections ----------------
+
+# Every function, method and closure radon found, in its block order
+def _function_rows(blocks) -> List[Dict[str, Any]]:
+    rows = []
+    stack = list(reversed(blocks))
+    while stack:
+        block = stack.pop()
+        if isinstance(block, Function):
+            rows.append({
+                "name": block.name,
+                "fullname": block.fullname,
+                "lineno": block.lineno,
+                "endline": block.endline,
+                "is_method": block.is_method,
+                "complexity": block.complexity,
+            })
+            stack.extend(reversed(block.closures))
+    return rows
+
+# Same shape as summarize_complexity: one entry per radon block
+def _complexity_summary(blocks) -> Dict[str, Any]:
+    complexity_map = {item.name: item.complexity for item in blocks}
+    if not complexity_map:
+        return {"info": "No functions found"}
+    values = list(complexity_map.values())
+    max_val = max(values)
+    return {
+        "total_functions": len(values),
+        "average_complexity": round(sum(values) / len(values), 2),
+        "max_complexity": max_val,
+        "risk_level": risk_level(max_val),
+        "per_function": complexity_map
+    }
+
+def _maintainability(volume: float, total_complexity: int, raw) -> Dict[str, Any]:
+    # Multi-line strings count as comments, as mi_visit(code, multi=True) does
+    comment_lines = raw.comments + raw.multi
+    comments = comment_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+    score = mi_compute(volume, total_complexity, raw.lloc, comments)
+    return {"score": round(score, 2), "status": mi_status(score)}
+
+
+# ---------------- Engine ----------------
+
+def analyze_metrics(code: str = None, context: AnalysisContext = None) -> Dict[str, Any]:
+    """
+    Complexity, maintainability, Halstead and raw line metrics in one pass.
+
+    The source is parsed once (or taken from `context`) and that AST feeds
+    both radon visitors; only the raw line counts re-tokenize the text.
+
+    Returns:
+    {
+        "functions": [{"name", "fullname", "lineno", "endline", "is_method", "complexity"}],
+        "complexity": summarize_complexity's dict,
+        "maintainability": {"score", "status"},
+        "halstead": {"total": {...}, "functions": {name: {...}}},
+        "raw": {"loc", "lloc", "sloc", "comments", "multi", "blank", "single_comments"}
+    }
+    or {"error": message} when the code cannot be analyzed.
+    """
+    if context is None:
+        context = AnalysisContext(code)
+    try:
+        tree = context.tree
+        visitor = ComplexityVisitor.from_ast(tree)
+        halstead = h_visit_ast(tree)
+        raw = analyze(context.source)
+    except Exception as e:
+        return {"error": str(e)}
+
+    return {
+        "functions": _function_rows(visitor.blocks),
+        "complexity": _complexity_summary(visitor.blocks),
+        "maintainability": _maintainability(halstead.total.volume, visitor.total_complexity, raw),
+        "halstead": {
+            "total": halstead.total._asdict(),
+            "functions": {name: report._asdict() for name, report in halstead.functions},
+        },
+        "raw": raw._asdict(),
+    }
@@ -0,0 +1,127 @@
+import ast
+import inspect
+import re
+from typing import Any, Dict, List, Optional
+
+from core.parser.python_parser import PROFILE_COVERAGE, _load_source, parse_path
+
+# ---------------- Token Patterns ----------------
+
+# String literal with optional prefix; triple-quoted forms first
+_STRING = r"""(?:[rRbBuUfF]{1,2})?(?:'''(?:[^\\]|\\.)*?'''|\"\"\"(?:[^\\]|\\.)*?\"\"\"|'(?:[^\\'\n]|\\.)*'|"(?:[^\\"\n]|\\.)*")"""
+_COMMENT = r"\#[^\n]*"
+
+# Module scan: only strings, comments and the `def` keyword are tokens,
+# everything else is skipped by the regex engine
+_SCAN_RE = re.compile(rf"(?P<string>{_STRING})|{_COMMENT}|(?P<def>\bdef\b)", re.S)
+
+# Signature scan: brackets, the closing colon and lambdas (whose colon would
+# be mistaken for the end of the signature)
+_SIGNATURE_RE = re.compile(rf"{_STRING}|{_COMMENT}|(?P<open>[(\[{{])|(?P<close>[)\]}}])|(?P<colon>:(?!=))|(?P<lambda>\blambda\b)", re.S)
+
+_NAME_RE = re.compile(r"[ \t\f]+([^\W\d]\w*)")
+_STRING_RE = re.compile(_STRING, re.S)
+_ASYNC_RE = re.compile(r"\basync[ \t\f]+$")
+# Whitespace, comments, blank lines and continuations before the body
+_GAP_RE = re.compile(r"(?:[ \t\f\r\n]|\\\r?\n|\#[^\n]*)*")
+# Whitespace that may separate implicitly concatenated strings on one logical line
+_INLINE_GAP_RE = re.compile(r"(?:[ \t\f]|\\\r?\n)*")
+
+
+class _Ambiguous(Exception):
+    """Raised when the scanner cannot be sure it matches the AST."""
+
+
+# Docstring of the body starting at `pos`, cleaned like ast.get_docstring
+def _docstring_at(source: str, pos: int) -> Optional[str]:
+    if source.startswith("(", pos):
+        raise _Ambiguous("parenthesized body expression")
+
+    literals = []
+    match = _STRING_RE.match(source, pos)
+    while match:
+        literal = match.group(0)
+        prefix = literal[:len(literal) - len(literal.lstrip("rRbBuUfF"))].lower()
+        if "f" in prefix or "b" in prefix:
+            return None  # f-strings and bytes are never docstrings
+        literals.append(literal)
+        pos = _INLINE_GAP_RE.match(source, match.end()).end()
+        match = _STRING_RE.match(source, pos)
+    if not literals:
+        return None
+
+    # The string must be the whole statement, not the start of an expression
+    if pos < len(source) and source[pos] not in "\r\n;#":
+        return None
+    try:
+        value = ast.literal_eval(" ".join(literals))
+    except (ValueError, SyntaxError) as e:
+        raise _Ambiguous(str(e))
+    return inspect.cleandoc(value)
+
+
+# End of the signature colon for a def whose name ends at `pos`
+def _signature_end(source: str, pos: int) -> int:
+    depth = 0
+    for match in _SIGNATURE_RE.finditer(source, pos):
+        kind = match.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+            if depth < 0:
+                break
+        elif kind == "lambda" and depth == 0:
+            raise _Ambiguous("lambda in annotation")
+        elif kind == "colon" and depth == 0:
+            return match.end()
+    raise _Ambiguous("unterminated signature")
+
+
+def scan_functions(source: str) -> List[Dict[str, Any]]:
+    """
+    Find functions and their docstrings without building an AST.
+
+    Returns {"name", "docstring"} records in source order for every
+    non-async def, with docstrings cleaned like ast.get_docstring. The
+    source is assumed to be valid Python; raises _Ambiguous on constructs
+    the scanner does not handle.
+    """
+    functions = []
+    for match in _SCAN_RE.finditer(source):
+        if match.lastgroup != "def":
+            continue
+        start = match.start()
+        line_start = source.rfind("\n", 0, start) + 1
+        if _ASYNC_RE.search(source, line_start, start):
+            continue
+        if source[line_start:start].rstrip().endswith("\\"):
+            raise _Ambiguous("continued def line")
+
+        name = _NAME_RE.match(source, match.end())
+        if name is None:
+            raise _Ambiguous("def without a name")
+        body = _GAP_RE.match(source, _signature_end(source, name.end())).end()
+        functions.append({"name": name.group(1), "docstring": _docstring_at(source, body)})
+    return functions
+
+
+def coverage_functions(file_path: str = None, file_content: str = None,
+                       check_syntax: bool = False) -> List[Dict[str, Any]]:
+    """
+    Names and docstrings of all functions, for docstring coverage.
+
+    Uses the regex scanner and falls back to the AST parser (coverage
+    profile) when the scanner hits something it cannot classify. Records
+    are in source order rather than parse_path's ast.walk order. The fast
+    path does not check the whole file for syntax errors; with
+    check_syntax=True the source is compiled first and a SyntaxError is
+    raised as parse_path would.
+    """
+    source = _load_source(file_path, file_content)
+    if check_syntax:
+        compile(source, file_path or "<uploaded>", "exec", ast.PyCF_ONLY_AST)
+    try:
+        return scan_functions(source)
+    except _Ambiguous:
+        return parse_path(file_content=source, profile=PROFILE_COVERAGE)
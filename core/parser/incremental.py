@@ -0,0 +1,107 @@
+import ast
+import hashlib
+import io
+import textwrap
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.parser.python_parser import _iter_function_records
+from core.parser.symbol_index import _BLOCK_NODES
+
+
+# Outermost FunctionDefs of a module as (level, order, node, qualname).
+# Only statement-level nodes are visited: definitions cannot appear inside
+# expressions, so the rest of the tree is never walked.
+def _iter_units(tree: ast.AST) -> Iterator[Tuple[int, int, ast.FunctionDef, str]]:
+    stack = [(tree, 0, ())]
+    order = 0
+    while stack:
+        node, level, scope = stack.pop()
+        if isinstance(node, ast.FunctionDef):
+            yield level, order, node, ".".join(scope + (node.name,))
+            order += 1
+            continue
+        order += 1
+
+        if isinstance(node, (ast.ClassDef, ast.AsyncFunctionDef)):
+            scope = scope + (node.name,)
+        children = [c for c in ast.iter_child_nodes(node) if isinstance(c, _BLOCK_NODES)]
+        for child in reversed(children):
+            stack.append((child, level + 1, scope))
+
+
+# Source span of a definition, decorators included
+def _span(node: ast.AST) -> Tuple[int, int]:
+    decorators = getattr(node, "decorator_list", None)
+    start = decorators[0].lineno if decorators else node.lineno
+    return start, node.end_lineno
+
+
+# Hash of a function's source with its indentation removed, so moving a
+# function or re-indenting its class does not count as a change
+def _fingerprint(lines: List[str], span: Tuple[int, int]) -> str:
+    segment = textwrap.dedent("".join(lines[span[0] - 1:span[1]]))
+    return hashlib.sha1(segment.encode("utf-8")).hexdigest()
+
+
+class IncrementalAnalyzer:
+    """
+    Re-analyze a module after an edit, touching only the functions that changed.
+
+    Every outermost function (with the functions nested inside it) is
+    fingerprinted from its source span. On update, functions whose
+    fingerprint was seen in the previous version reuse their records; only
+    new or edited ones go through the metric collector. The result is the
+    same list parse_path would return for the new source.
+    """
+
+    def __init__(self):
+        self.source: Optional[str] = None
+        self.tree: Optional[ast.Module] = None
+        self.functions: List[Dict[str, Any]] = []
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        self.fingerprints: Dict[str, str] = {}
+        self.reanalyzed = 0
+        self.reused = 0
+        self._units: Dict[str, List[Tuple[int, int, Dict[str, Any]]]] = {}
+
+    def update(self, source: str, filename: str = "<uploaded>") -> List[Dict[str, Any]]:
+        if source == self.source:
+            return self.functions
+
+        tree = ast.parse(source, filename=filename)
+        # Split like the tokenizer does (str.splitlines also breaks on \f etc.)
+        lines = io.StringIO(source, newline="").readlines()
+        units = {}
+        spans = {}
+        fingerprints = {}
+        found = []
+        self.reanalyzed = self.reused = 0
+
+        for level, order, node, qualname in _iter_units(tree):
+            span = _span(node)
+            fingerprint = _fingerprint(lines, span)
+            records = units.get(fingerprint) or self._units.get(fingerprint)
+            if records is None:
+                records = list(_iter_function_records(node))
+                self.reanalyzed += 1
+            else:
+                self.reused += 1
+            units[fingerprint] = records
+            spans[qualname] = span
+            fingerprints[qualname] = fingerprint
+            # Unit records are named relative to the unit, since the same
+            # function may be reused under another class
+            prefix = qualname.rpartition(".")[0]
+            for rel_level, rel_order, record in records:
+                if prefix:
+                    record = dict(record, qualname=f"{prefix}.{record['qualname']}")
+                found.append((level + rel_level, order, rel_order, record))
+
+        found.sort(key=lambda item: item[:3])
+        self.source = source
+        self.tree = tree
+        self.functions = [record for *_, record in found]
+        self.spans = spans
+        self.fingerprints = fingerprints
+        self._units = units
+        return self.functions
@@ -0,0 +1,37 @@
+import hashlib
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from core.cache.sqlite_cache import SQLiteCache
+from core.parser.python_parser import PARSER_VERSION, PROFILE_FULL
+
+DEFAULT_CACHE_PATH = os.path.join("storage", "cache", "parse_cache.db")
+
+
+class ParseCache(SQLiteCache):
+    """
+    On-disk cache of parse_path results keyed by file contents.
+
+    The key is a SHA-256 of the parser version, the parse profile and the
+    raw source, so an unchanged file is never parsed twice, and bumping
+    PARSER_VERSION invalidates every entry at once.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 200_000):
+        super().__init__(path, max_entries=max_entries)
+
+    @staticmethod
+    def key_for(content: Union[str, bytes], profile: str = PROFILE_FULL) -> str:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        digest = hashlib.sha256(f"{PARSER_VERSION}/{profile}".encode("ascii"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def lookup(self, content: Union[str, bytes], profile: str = PROFILE_FULL) -> Optional[List[Dict[str, Any]]]:
+        return self.get(self.key_for(content, profile))
+
+    def store(self, content: Union[str, bytes], functions: List[Dict[str, Any]],
+              profile: str = PROFILE_FULL) -> None:
+        self.put(self.key_for(content, profile), functions)
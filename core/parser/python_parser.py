@@ -1,20 +1,68 @@
 import ast
 import os
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.parser.records import FunctionRecord
+from core.parser.symbol_index import _BLOCK_NODES, module_name, symbol_entries
+
+# Bump whenever the shape or meaning of function records changes;
+# persisted parse results are keyed on it.
+PARSER_VERSION = "4"
+
+# Parse profiles: "full" fills in every field; "coverage" records only what
+# docstring coverage needs (name, qualname, argument names, docstring), so
+# nesting, type hints and unparsing are skipped and only statements are walked.
+PROFILE_FULL = "full"
+PROFILE_COVERAGE = "coverage"
+PROFILES = (PROFILE_FULL, PROFILE_COVERAGE)
+
+LONG_FUNCTION_THRESHOLD = 50
+NESTING_THRESHOLD = 3
+
+# Statements that open a new nesting level
+_NESTING_NODES = (ast.If, ast.For, ast.While, ast.Try, ast.With)
+# Nodes whose name prefixes the qualified names of functions inside them
+_SCOPE_NODES = (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Directories skipped when scanning a repository
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", ".venv", "venv", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", "node_modules",
+}
 
 # ---------------- Helper Functions ----------------
 
+# Source text of a node. Plain names, dotted names and None/bool/int
+# constants (most annotations and defaults) are rendered directly, with the
+# same result ast.unparse would give; everything else goes through unparse.
+def _unparse(node: ast.AST) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        return f"{node.value.id}.{node.attr}"
+    if isinstance(node, ast.Constant) and (node.value is None or type(node.value) in (bool, int)):
+        return repr(node.value)
+    return ast.unparse(node)
+
 # Get type annotation as string
 def _get_annotation(node: Optional[ast.AST]) -> Optional[str]:
     if node is None:
         return None
-    return ast.unparse(node)  # Converts AST node to string
+    return _unparse(node)  # Converts AST node to string
 
 # Get default value as string
 def _get_default_str(node: Optional[ast.AST]) -> Optional[str]:
     if node is None:
         return None
-    return ast.unparse(node)
+    return _unparse(node)
+
+def _check_profile(profile: str, compact: bool = False) -> None:
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown parse profile: {profile!r} (expected one of {PROFILES})")
+    if compact and profile != PROFILE_FULL:
+        raise ValueError("Compact records need the full profile")
 
 # Simple complexity: number of statements in the function
 def _simple_complexity(node: ast.FunctionDef) -> int:
@@ -25,7 +73,7 @@ def _max_nesting_depth(node: ast.FunctionDef) -> int:
     def depth(n, current=0):
         max_d = current
         for child in ast.iter_child_nodes(n):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.Try, ast.With)):
+            if isinstance(child, _NESTING_NODES):
                 max_d = max(max_d, depth(child, current + 1))
             else:
                 max_d = max(max_d, depth(child, current))
@@ -35,11 +83,11 @@ def _max_nesting_depth(node: ast.FunctionDef) -> int:
 # ---------------- Smell Detection ----------------
 
 # Long function: threshold > 50 statements
-def is_long_function(node: ast.FunctionDef, threshold=50) -> bool:
+def is_long_function(node: ast.FunctionDef, threshold=LONG_FUNCTION_THRESHOLD) -> bool:
     return len(node.body) > threshold
 
 # Deeply nested function: threshold > 3
-def is_deeply_nested(node: ast.FunctionDef, threshold=3) -> bool:
+def is_deeply_nested(node: ast.FunctionDef, threshold=NESTING_THRESHOLD) -> bool:
     return _max_nesting_depth(node) > threshold
 
 # Missing type hints for args or return
@@ -53,7 +101,19 @@ def missing_type_hints(node: ast.FunctionDef) -> List[str]:
     return missing
 
 # ---------------- Parse Function ----------------
-def _parse_function(node: ast.FunctionDef) -> Dict[str, Any]:
+def _parse_function(node: ast.FunctionDef, max_nesting: Optional[int] = None,
+                    profile: str = PROFILE_FULL, qualname: Optional[str] = None) -> Dict[str, Any]:
+    if profile == PROFILE_COVERAGE:
+        return {
+            "name": node.name,
+            "qualname": qualname or node.name,
+            "args": [{"name": arg.arg} for arg in node.args.args],
+            "docstring": ast.get_docstring(node),
+        }
+
+    if max_nesting is None:
+        max_nesting = _max_nesting_depth(node)
+
     args = []
     defaults = [None]*(len(node.args.args) - len(node.args.defaults)) + node.args.defaults
     for arg, default in zip(node.args.args, defaults):
@@ -65,42 +125,319 @@ def _parse_function(node: ast.FunctionDef) -> Dict[str, Any]:
 
     return {
         "name": node.name,
+        "qualname": qualname or node.name,
         "args": args,
+        "returns": _get_annotation(node.returns),
         "complexity": _simple_complexity(node),
-        "max_nesting": _max_nesting_depth(node),
+        "max_nesting": max_nesting,
         "docstring": ast.get_docstring(node),
-        "is_long": is_long_function(node),
-        "is_deeply_nested": is_deeply_nested(node),
+        "is_long": len(node.body) > LONG_FUNCTION_THRESHOLD,
+        "is_deeply_nested": max_nesting > NESTING_THRESHOLD,
         "missing_type_hints": missing_type_hints(node)
     }
 
+# Record of a single function node, nesting measured from the node itself
+def parse_function(node: ast.AST, profile: str = PROFILE_FULL) -> Dict[str, Any]:
+    _check_profile(profile)
+    return _parse_function(node, profile=profile)
+
+# ---------------- Single-Pass Collector ----------------
+
+# Yields (level, order, record) for every FunctionDef under `root`.
+# One iterative walk computes nesting for all functions at once: each open
+# function keeps the deepest absolute nesting seen inside it, and hands it to
+# its parent when it closes. `level` is the node depth (as in ast.walk) and
+# `order` the pre-order index, so sorting by both reproduces ast.walk order.
+# `scope` holds the enclosing class and function names, giving the same
+# module-relative qualified names as symbol_index.iter_symbols.
+def _iter_function_records(root: ast.AST, level: int = 0, profile: str = PROFILE_FULL, scope: str = ""):
+    if profile == PROFILE_COVERAGE:
+        yield from _iter_coverage_records(root, level, scope)
+        return
+    frames = []  # [base_nesting, deepest_nesting] per open function
+    stack = [(root, level, 0, False, scope)]
+    order = 0
+    while stack:
+        node, depth, nesting, closing, scope = stack.pop()
+        if closing:
+            base, deepest, node_order = frames.pop()
+            if frames and deepest > frames[-1][1]:
+                frames[-1][1] = deepest
+            yield depth, node_order, _parse_function(node, deepest - base, profile, scope)
+            continue
+
+        if isinstance(node, _NESTING_NODES):
+            nesting += 1
+        if frames and nesting > frames[-1][1]:
+            frames[-1][1] = nesting
+        if isinstance(node, _SCOPE_NODES):
+            scope = f"{scope}.{node.name}" if scope else node.name
+        if isinstance(node, ast.FunctionDef):
+            frames.append([nesting, nesting, order])
+            stack.append((node, depth, nesting, True, scope))
+        order += 1
+
+        children = list(ast.iter_child_nodes(node))
+        for child in reversed(children):
+            stack.append((child, depth + 1, nesting, False, scope))
+
+# Coverage-profile walk: same (level, order, record) items and yield order,
+# but only statement-level nodes are visited (definitions cannot appear
+# inside expressions) and no nesting is tracked
+def _iter_coverage_records(root: ast.AST, level: int = 0, scope: str = ""):
+    stack = [(root, level, None, scope)]
+    order = 0
+    while stack:
+        node, depth, node_order, scope = stack.pop()
+        if node_order is not None:
+            yield depth, node_order, _parse_function(node, profile=PROFILE_COVERAGE, qualname=scope)
+            continue
+
+        if isinstance(node, _SCOPE_NODES):
+            scope = f"{scope}.{node.name}" if scope else node.name
+        if isinstance(node, ast.FunctionDef):
+            stack.append((node, depth, order, scope))
+        order += 1
+
+        children = [c for c in ast.iter_child_nodes(node) if isinstance(c, _BLOCK_NODES)]
+        for child in reversed(children):
+            stack.append((child, depth + 1, None, scope))
+
+# Collect all function records of a parsed tree in ast.walk order
+def parse_tree(tree: ast.AST, compact: bool = False, profile: str = PROFILE_FULL) -> List[Dict[str, Any]]:
+    _check_profile(profile, compact)
+    found = sorted(_iter_function_records(tree, profile=profile), key=lambda item: item[:2])
+    if compact:
+        return [FunctionRecord.from_dict(record) for _, _, record in found]
+    return [record for _, _, record in found]
+
 # ---------------- Parse Path ----------------
-def parse_path(file_path: str = None, file_content: str = None) -> List[Dict[str, Any]]:
+
+# Source to parse: text as before, or raw bytes when it is also hashed
+def _load_source(file_path: Optional[str], file_content: Optional[str], binary: bool = False):
+    if file_content is not None:
+        return file_content
+    if file_path is not None:
+        with open(file_path, "rb" if binary else "r") as f:
+            return f.read()
+    raise ValueError("Either file_path or file_content must be provided.")
+
+def parse_path(file_path: str = None, file_content: str = None, cache=None,
+               compact: bool = False, profile: str = PROFILE_FULL) -> List[Dict[str, Any]]:
     """
     Parse functions from a Python file or uploaded code content.
+
+    If a ParseCache is given, results are looked up by content hash first
+    and stored after a miss. With compact=True, FunctionRecord tuples are
+    returned instead of dicts. profile="coverage" records only names,
+    argument names and docstrings, for callers that only need coverage;
+    it cannot be combined with compact=True.
     """
-    if file_content is not None:
-        tree = ast.parse(file_content, filename=file_path or "<uploaded>")
-    elif file_path is not None:
-        with open(file_path, "r") as f:
-            tree = ast.parse(f.read(), filename=file_path)
+    _check_profile(profile, compact)
+    source = _load_source(file_path, file_content, binary=cache is not None)
+
+    if cache is not None:
+        functions = cache.lookup(source, profile)
+        if functions is None:
+            functions = parse_tree(ast.parse(source, filename=file_path or "<uploaded>"), profile=profile)
+            cache.store(source, functions, profile)
+        return [FunctionRecord.from_dict(f) for f in functions] if compact else functions
+
+    tree = ast.parse(source, filename=file_path or "<uploaded>")
+    return parse_tree(tree, compact=compact, profile=profile)
+
+def iter_functions(file_path: str = None, file_content: str = None,
+                   compact: bool = False, profile: str = PROFILE_FULL) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the function records of one file as the parser produces them.
+
+    Nothing is collected up front: each record is yielded as soon as its
+    function has been walked, so inner functions come before the function
+    that contains them. Use parse_path when ast.walk order matters.
+    """
+    _check_profile(profile, compact)
+    source = _load_source(file_path, file_content)
+    tree = ast.parse(source, filename=file_path or "<uploaded>")
+    for _, _, record in _iter_function_records(tree, profile=profile):
+        yield FunctionRecord.from_dict(record) if compact else record
+
+
+# ---------------- Parse Directory ----------------
+
+# All .py files under root, in a stable (sorted) order
+def iter_python_files(root: str) -> Iterator[str]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                yield os.path.join(dirpath, name)
+
+# Parse one file into the per-file shape used by the reporter
+# (symbol entries ride along for the index and are removed by _finish)
+def _parse_file(file_path: str, content: Optional[bytes] = None,
+                profile: str = PROFILE_FULL, symbols: bool = False) -> Dict[str, Any]:
+    try:
+        source = content if content is not None else _load_source(file_path, None)
+        tree = ast.parse(source, filename=file_path)
+    except (SyntaxError, ValueError, UnicodeDecodeError, OSError) as e:
+        return {"file_path": file_path, "functions": [], "error": str(e)}
+    result = {"file_path": file_path, "functions": parse_tree(tree, profile=profile)}
+    if symbols:
+        result["symbols"] = symbol_entries(tree)
+    return result
+
+# Worker task: one batch of files
+def _parse_files(paths: List[str], contents: List[Optional[bytes]], profile: str,
+                 symbols: bool) -> List[Dict[str, Any]]:
+    return [_parse_file(path, content, profile, symbols) for path, content in zip(paths, contents)]
+
+# Cached result for a file, or the bytes to parse on a miss. Parsing exactly
+# the bytes that were hashed means a file edited mid-run cannot be cached
+# under a stale key. A hit whose symbols are not indexed yet counts as a miss.
+def _lookup(file_path: str, cache, profile: str, index=None):
+    if cache is None:
+        return None, None
+    try:
+        with open(file_path, "rb") as f:
+            content = f.read()
+    except OSError as e:
+        return {"file_path": file_path, "functions": [], "error": str(e)}, None
+    if index is not None and index.digest(file_path) != cache.key_for(content):
+        return None, content
+    functions = cache.lookup(content, profile)
+    if functions is not None:
+        return {"file_path": file_path, "functions": functions}, None
+    return None, content
+
+# Cache a freshly parsed result and move its symbols into the index
+def _finish(result: Dict[str, Any], content: Optional[bytes], cache, profile: str,
+            index, root: Optional[str]) -> Dict[str, Any]:
+    symbols = result.pop("symbols", None)
+    if cache is not None and content is not None and "error" not in result:
+        cache.store(content, result["functions"], profile)
+    if index is not None:
+        digest = cache.key_for(content) if cache is not None and content is not None else None
+        module = module_name(result["file_path"], root)
+        index.update_file(result["file_path"], symbols or [], module, digest=digest)
+    return result
+
+def _compact(result: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(result, functions=[FunctionRecord.from_dict(f) for f in result["functions"]])
+
+def _iter_directory(root: str, workers: Optional[int], chunksize: int, cache,
+                    profile: str, index) -> Iterator[Dict[str, Any]]:
+    symbols = index is not None
+    if workers == 1:
+        for path in iter_python_files(root):
+            result, content = _lookup(path, cache, profile, index)
+            if result is None:
+                result = _parse_file(path, content, profile, symbols)
+                _finish(result, content, cache, profile, index, root)
+            yield result
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = 4 * workers  # batches in flight, bounds memory held by results
+    in_flight = deque()
+
+    def submit(pool, batch):
+        misses = [(path, content) for path, content, result in batch if result is None]
+        future = None
+        if misses:
+            paths, contents = zip(*misses)
+            future = pool.submit(_parse_files, list(paths), list(contents), profile, symbols)
+        in_flight.append((batch, future))
+
+    def drain():
+        batch, future = in_flight.popleft()
+        parsed = iter(future.result() if future is not None else ())
+        for path, content, result in batch:
+            if result is None:
+                result = next(parsed)
+                _finish(result, content, cache, profile, index, root)
+            yield result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch = []
+        for path in iter_python_files(root):
+            result, content = _lookup(path, cache, profile, index)
+            batch.append((path, content, result))
+            if len(batch) >= chunksize:
+                submit(pool, batch)
+                batch = []
+                while len(in_flight) >= window:
+                    yield from drain()
+        if batch:
+            submit(pool, batch)
+        while in_flight:
+            yield from drain()
+
+# Pass directory results through, then drop index entries for files under
+# `root` the finished pass did not visit (deleted, renamed or now skipped)
+def _prune_unvisited(results: Iterator[Dict[str, Any]], root: str, index) -> Iterator[Dict[str, Any]]:
+    visited = set()
+    for result in results:
+        visited.add(result["file_path"])
+        yield result
+    prefix = os.path.join(root, "")
+    for file_path in index.files():
+        if file_path.startswith(prefix) and file_path not in visited:
+            index.remove_file(file_path)
+
+def iter_path(path: str, workers: Optional[int] = None, chunksize: int = 16, cache=None,
+              compact: bool = False, profile: str = PROFILE_FULL, index=None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream {"file_path", "functions"} results for a file or a directory tree.
+
+    Directory results are yielded in path order while later files are still
+    being parsed; only a bounded window of batches is in flight at a time,
+    so memory does not grow with the size of the tree. Options are the same
+    as for parse_directory.
+    """
+    _check_profile(profile, compact)
+    if os.path.isfile(path):
+        result, content = _lookup(path, cache, profile, index)
+        if result is None:
+            result = _parse_file(path, content, profile, symbols=index is not None)
+            _finish(result, content, cache, profile, index, None)
+        results = iter([result])
+    elif os.path.isdir(path):
+        results = _iter_directory(path, workers, chunksize, cache, profile, index)
+        if index is not None:
+            results = _prune_unvisited(results, path, index)
     else:
-        raise ValueError("Either file_path or file_content must be provided.")
+        raise ValueError(f"No such file or directory: {path}")
+
+    for result in results:
+        yield _compact(result) if compact else result
 
-    functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-    return [_parse_function(f) for f in functions]
+def parse_directory(root: str, workers: Optional[int] = None, chunksize: int = 16, cache=None,
+                    compact: bool = False, profile: str = PROFILE_FULL, index=None) -> List[Dict[str, Any]]:
+    """
+    Parse every Python file under a directory tree using a process pool.
+
+    Returns one {"file_path", "functions"} entry per file, ordered by path,
+    ready for compute_coverage. Files that cannot be read or parsed get an
+    "error" key and an empty function list. workers=None uses one process
+    per CPU; workers=1 parses in the current process. With a ParseCache,
+    only files whose contents are not cached are sent to the pool. A
+    SymbolIndex passed as `index` is updated from the same parse, with
+    module names relative to `root`; files under `root` that no longer
+    exist are removed from it.
+    """
+    if not os.path.isdir(root):
+        raise ValueError(f"Not a directory: {root}")
+    return list(iter_path(root, workers=workers, chunksize=chunksize, cache=cache,
+                          compact=compact, profile=profile, index=index))
 
 
 # ---------------- Example Usage ----------------
 if __name__ == "__main__":
     examples_folder = "examples"
     if os.path.exists(examples_folder):
-        files = [f for f in os.listdir(examples_folder) if f.endswith(".py")]
-        for file in files:
-            path = os.path.join(examples_folder, file)
-            print(f"\nParsing file: {file}")
-            funcs = parse_path(file_path=path)
-            for f in funcs:
+        for result in parse_directory(examples_folder):
+            print(f"\nParsing file: {result['file_path']}")
+            for f in result["functions"]:
                 print(f)
     else:
         print(f"Folder '{examples_folder}' not found!")
@@ -0,0 +1,201 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# ---------------- Compact Records ----------------
+
+# Bits of FunctionTable.flags
+_HAS_DOCSTRING = 1
+_IS_LONG = 2
+_IS_DEEPLY_NESTED = 4
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+class ArgRecord(NamedTuple):
+    name: str
+    annotation: Optional[str]
+    default: Optional[str]
+
+
+class FunctionRecord(NamedTuple):
+    """Immutable, tuple-backed form of one parse_path function dict."""
+
+    name: str
+    args: Tuple[ArgRecord, ...]
+    complexity: int
+    max_nesting: int
+    docstring: Optional[str]
+    is_long: bool
+    is_deeply_nested: bool
+    missing_type_hints: Tuple[str, ...]
+    qualname: Optional[str] = None
+    returns: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, fn: Dict[str, Any]) -> "FunctionRecord":
+        return cls(
+            name=sys.intern(fn["name"]),
+            args=tuple(
+                ArgRecord(sys.intern(a["name"]), _intern(a.get("annotation")), _intern(a.get("default")))
+                for a in fn["args"]
+            ),
+            complexity=fn["complexity"],
+            max_nesting=fn["max_nesting"],
+            docstring=fn["docstring"],
+            is_long=fn["is_long"],
+            is_deeply_nested=fn["is_deeply_nested"],
+            missing_type_hints=tuple(sys.intern(h) for h in fn["missing_type_hints"]),
+            qualname=_intern(fn.get("qualname")),
+            returns=_intern(fn.get("returns")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        fn = {"name": self.name}
+        if self.qualname is not None:
+            fn["qualname"] = self.qualname
+        return {
+            **fn,
+            "args": [a._asdict() for a in self.args],
+            "returns": self.returns,
+            "complexity": self.complexity,
+            "max_nesting": self.max_nesting,
+            "docstring": self.docstring,
+            "is_long": self.is_long,
+            "is_deeply_nested": self.is_deeply_nested,
+            "missing_type_hints": list(self.missing_type_hints),
+        }
+
+
+# ---------------- Columnar Table ----------------
+
+class FunctionTable:
+    """
+    Column-oriented store for many function records.
+
+    Numeric fields and flags live in typed arrays, names and annotations
+    are interned, and per-function argument lists are flattened into
+    shared columns addressed by offsets. Rows are rebuilt on access as
+    FunctionRecord (or dicts via to_dicts).
+    """
+
+    __slots__ = (
+        "names", "qualnames", "returns", "docstrings", "complexity", "max_nesting", "flags",
+        "arg_offsets", "arg_names", "arg_annotations", "arg_defaults",
+        "hint_offsets", "missing_type_hints",
+    )
+
+    def __init__(self, records: Iterable[Union[FunctionRecord, Dict[str, Any]]] = ()):
+        self.names: List[str] = []
+        self.qualnames: List[Optional[str]] = []
+        self.returns: List[Optional[str]] = []
+        self.docstrings: List[Optional[str]] = []
+        self.complexity = array("l")
+        self.max_nesting = array("l")
+        self.flags = array("B")
+        self.arg_offsets = array("q", [0])
+        self.arg_names: List[str] = []
+        self.arg_annotations: List[Optional[str]] = []
+        self.arg_defaults: List[Optional[str]] = []
+        self.hint_offsets = array("q", [0])
+        self.missing_type_hints: List[str] = []
+        self.extend(records)
+
+    def append(self, record: Union[FunctionRecord, Dict[str, Any]]) -> None:
+        if isinstance(record, dict):
+            record = FunctionRecord.from_dict(record)
+        self.names.append(sys.intern(record.name))
+        self.qualnames.append(_intern(record.qualname))
+        self.returns.append(_intern(record.returns))
+        self.docstrings.append(record.docstring)
+        self.complexity.append(record.complexity)
+        self.max_nesting.append(record.max_nesting)
+        self.flags.append(
+            (_HAS_DOCSTRING if record.docstring else 0)
+            | (_IS_LONG if record.is_long else 0)
+            | (_IS_DEEPLY_NESTED if record.is_deeply_nested else 0)
+        )
+        for arg in record.args:
+            self.arg_names.append(sys.intern(arg.name))
+            self.arg_annotations.append(_intern(arg.annotation))
+            self.arg_defaults.append(_intern(arg.default))
+        self.arg_offsets.append(len(self.arg_names))
+        self.missing_type_hints.extend(sys.intern(h) for h in record.missing_type_hints)
+        self.hint_offsets.append(len(self.missing_type_hints))
+
+    def extend(self, records: Iterable[Union[FunctionRecord, Dict[str, Any]]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> FunctionRecord:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("FunctionTable index out of range")
+        start, end = self.arg_offsets[i], self.arg_offsets[i + 1]
+        hints_start, hints_end = self.hint_offsets[i], self.hint_offsets[i + 1]
+        return FunctionRecord(
+            name=self.names[i],
+            args=tuple(
+                ArgRecord(self.arg_names[j], self.arg_annotations[j], self.arg_defaults[j])
+                for j in range(start, end)
+            ),
+            complexity=self.complexity[i],
+            max_nesting=self.max_nesting[i],
+            docstring=self.docstrings[i],
+            is_long=bool(self.flags[i] & _IS_LONG),
+            is_deeply_nested=bool(self.flags[i] & _IS_DEEPLY_NESTED),
+            missing_type_hints=tuple(self.missing_type_hints[hints_start:hints_end]),
+            qualname=self.qualnames[i],
+            returns=self.returns[i],
+        )
+
+    def __iter__(self) -> Iterator[FunctionRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def documented_count(self) -> int:
+        return sum(1 for flag in self.flags if flag & _HAS_DOCSTRING)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self]
+
+
+# ---------------- Adapters ----------------
+
+# Dict form of any supported record container
+def to_dicts(functions: Iterable[Union[FunctionRecord, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    if isinstance(functions, FunctionTable):
+        return functions.to_dicts()
+    return [f if isinstance(f, dict) else f.to_dict() for f in functions]
+
+
+# Docstring of a dict record or a FunctionRecord
+def get_docstring(fn: Union[FunctionRecord, Dict[str, Any]]) -> Optional[str]:
+    return fn.get("docstring") if isinstance(fn, dict) else fn.docstring
+
+
+def get_name(fn: Union[FunctionRecord, Dict[str, Any]]) -> str:
+    return fn.get("name") if isinstance(fn, dict) else fn.name
+
+
+def get_qualname(fn: Union[FunctionRecord, Dict[str, Any]]) -> Optional[str]:
+    return fn.get("qualname") if isinstance(fn, dict) else fn.qualname
+
+
+# Stable per-file keys for function records: the qualified name (records
+# from older parser versions fall back to the name), with "#n" added to the
+# n-th repeat (n >= 2), e.g. for a function redefined under an if/else
+def function_keys(functions: Iterable[Union[FunctionRecord, Dict[str, Any]]]) -> List[str]:
+    keys = []
+    seen: Dict[str, int] = {}
+    for fn in functions:
+        base = get_qualname(fn) or get_name(fn)
+        seen[base] = seen.get(base, 0) + 1
+        keys.append(base if seen[base] == 1 else f"{base}#{seen[base]}")
+    return keys
@@ -0,0 +1,131 @@
+import ast
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Nodes that can hold statements (and therefore definitions)
+_BLOCK_NODES = (ast.stmt, ast.excepthandler) + ((ast.match_case,) if hasattr(ast, "match_case") else ())
+
+_SYMBOL_KINDS = {
+    ast.FunctionDef: "function",
+    ast.AsyncFunctionDef: "async_function",
+    ast.ClassDef: "class",
+}
+
+# ---------------- Symbol Extraction ----------------
+
+# Dotted module name of a file, relative to the repository root
+def module_name(file_path: str, root: Optional[str] = None) -> str:
+    path = os.path.relpath(file_path, root) if root else os.path.basename(file_path)
+    path = os.path.splitext(path)[0]
+    parts = [p for p in path.split(os.sep) if p not in ("", ".")]
+    if len(parts) > 1 and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+# (qualified name, node) for every class and function of a module, in
+# source order. Names are relative to the module: Class.method, outer.inner.
+def iter_symbols(tree: ast.AST) -> Iterator[Tuple[str, ast.AST]]:
+    stack = [(tree, ())]
+    while stack:
+        node, scope = stack.pop()
+        if type(node) in _SYMBOL_KINDS:
+            scope = scope + (node.name,)
+            yield ".".join(scope), node
+        children = [c for c in ast.iter_child_nodes(node) if isinstance(c, _BLOCK_NODES)]
+        for child in reversed(children):
+            stack.append((child, scope))
+
+# Index entries for a parsed module; qualified names are module-relative
+def symbol_entries(tree: ast.AST) -> List[Dict[str, Any]]:
+    entries = []
+    for qualname, node in iter_symbols(tree):
+        entries.append({
+            "qualname": qualname,
+            "name": node.name,
+            "kind": _SYMBOL_KINDS[type(node)],
+            "lineno": node.lineno,
+            "end_lineno": node.end_lineno,
+            "has_docstring": bool(ast.get_docstring(node)),
+        })
+    return entries
+
+
+# ---------------- Symbol Index ----------------
+
+class SymbolIndex:
+    """
+    Repository-wide map from qualified name (module.Class.method) to symbol.
+
+    Lookups are dictionary hits. Each file's symbols are tracked separately,
+    so re-indexing or removing one file only touches that file's entries.
+    When two definitions share a qualified name, the later one wins, as it
+    would at runtime.
+    """
+
+    def __init__(self):
+        self._symbols: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, List[str]] = {}
+        self._digests: Dict[str, str] = {}
+
+    def update_file(self, file_path: str, entries: List[Dict[str, Any]], module: Optional[str] = None,
+                    digest: Optional[str] = None) -> None:
+        """Replace a file's symbols; `digest` records which contents they came from."""
+        self.remove_file(file_path)
+        if digest is not None:
+            self._digests[file_path] = digest
+        if module is None:
+            module = module_name(file_path)
+        names = []
+        for entry in entries:
+            qualname = f"{module}.{entry['qualname']}" if module else entry["qualname"]
+            self._symbols[qualname] = dict(entry, qualname=qualname, file_path=file_path)
+            names.append(qualname)
+        self._files[file_path] = names
+
+    def index_tree(self, file_path: str, tree: ast.AST, module: Optional[str] = None) -> None:
+        self.update_file(file_path, symbol_entries(tree), module)
+
+    def remove_file(self, file_path: str) -> None:
+        self._digests.pop(file_path, None)
+        for qualname in self._files.pop(file_path, ()):
+            entry = self._symbols.get(qualname)
+            if entry is not None and entry["file_path"] == file_path:
+                del self._symbols[qualname]
+
+    def get(self, qualname: str) -> Optional[Dict[str, Any]]:
+        return self._symbols.get(qualname)
+
+    def __contains__(self, qualname: str) -> bool:
+        return qualname in self._symbols
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def names(self, file_path: Optional[str] = None) -> List[str]:
+        if file_path is None:
+            return list(self._symbols)
+        return [n for n in self._files.get(file_path, ()) if n in self._symbols]
+
+    def files(self) -> List[str]:
+        return list(self._files)
+
+    def digest(self, file_path: str) -> Optional[str]:
+        return self._digests.get(file_path)
+
+    def save(self, path: str) -> None:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"files": self._files, "symbols": self._symbols, "digests": self._digests}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "SymbolIndex":
+        with open(path, "r") as f:
+            data = json.load(f)
+        index = cls()
+        index._files = data["files"]
+        index._symbols = data["symbols"]
+        index._digests = data.get("digests", {})
+        return index
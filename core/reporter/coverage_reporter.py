@@ -1,5 +1,21 @@
 import json
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional
+
+from core.parser.records import FunctionTable, get_docstring
+from core.reporter.report_writers import coverage_records, write_json, write_ndjson
+
+# (total, documented) for dict records, FunctionRecords or a FunctionTable.
+# Counted in one pass so a generator of records can be consumed directly.
+def _count_functions(functions):
+    if isinstance(functions, FunctionTable):
+        return len(functions), functions.documented_count()
+    total = documented = 0
+    for f in functions:
+        total += 1
+        if get_docstring(f):
+            documented += 1
+    return total, documented
 
 # Compute docstring coverage per file
 def compute_coverage(per_file_results: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -10,8 +26,7 @@ def compute_coverage(per_file_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     for file_result in per_file_results:
         file_name = file_result.get("file_path", "unknown")
         functions = file_result.get("functions", [])
-        file_total = len(functions)
-        file_with_doc = sum(1 for f in functions if f.get("docstring"))
+        file_total, file_with_doc = _count_functions(functions)
         
         total_functions += file_total
         total_with_doc += file_with_doc
@@ -32,10 +47,108 @@ def compute_coverage(per_file_results: List[Dict[str, Any]]) -> Dict[str, Any]:
 
     return report
 
-# Write report to JSON file
-def write_report(reports: Dict[str, Any], path: str) -> None:
-    with open(path, "w") as f:
-        json.dump(reports, f, indent=4)
+def _entry(total: int, documented: int) -> Dict[str, Any]:
+    coverage = (documented / total * 100) if total else 0
+    return {
+        "total_functions": total,
+        "functions_with_docstring": documented,
+        "coverage_percent": round(coverage, 2)
+    }
+
+class CoverageAggregator:
+    """
+    Coverage report kept up to date one file at a time.
+
+    Each file's (total, documented) counters are stored next to running
+    overall totals, so adding, replacing or removing a file costs only
+    that file's functions, never a pass over the whole repository.
+    report() gives the same shape as compute_coverage, and the state can
+    be saved and loaded to carry over between runs.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, List[int]] = {}
+        self._total = 0
+        self._documented = 0
+
+    def set_file(self, file_path: str, functions) -> Dict[str, Any]:
+        """Record (or replace) one file's functions; returns its report entry."""
+        total, documented = _count_functions(functions)
+        self.remove_file(file_path)
+        self._files[file_path] = [total, documented]
+        self._total += total
+        self._documented += documented
+        return _entry(total, documented)
+
+    def add(self, file_result: Dict[str, Any]) -> Dict[str, Any]:
+        """set_file for one parser result ({"file_path", "functions"})."""
+        return self.set_file(file_result.get("file_path", "unknown"), file_result.get("functions") or [])
+
+    def remove_file(self, file_path: str) -> bool:
+        counts = self._files.pop(file_path, None)
+        if counts is None:
+            return False
+        self._total -= counts[0]
+        self._documented -= counts[1]
+        return True
+
+    def apply_delta(self, delta: Dict[str, Any]) -> None:
+        """Apply a watch-mode delta ({"changed": {path: result}, "removed": [paths]})."""
+        for file_path in delta.get("removed", ()):
+            self.remove_file(file_path)
+        for file_path, result in delta.get("changed", {}).items():
+            self.set_file(file_path, result.get("functions") or [])
+
+    def file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        counts = self._files.get(file_path)
+        return _entry(*counts) if counts is not None else None
+
+    def overall(self) -> Dict[str, Any]:
+        return _entry(self._total, self._documented)
+
+    def report(self) -> Dict[str, Any]:
+        report = {file_path: _entry(*counts) for file_path, counts in self._files.items()}
+        report["overall"] = self.overall()
+        return report
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._files
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"files": self._files}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoverageAggregator":
+        aggregator = cls()
+        for file_path, (total, documented) in data.get("files", {}).items():
+            aggregator._files[file_path] = [total, documented]
+            aggregator._total += total
+            aggregator._documented += documented
+        return aggregator
+
+    def save(self, path: str) -> None:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "CoverageAggregator":
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+# Write report to a file: indented JSON by default, compact JSON with
+# compact=True, one record per line for .ndjson paths; a .gz suffix
+# compresses any of them. See report_writers for SARIF output.
+def write_report(reports: Dict[str, Any], path: str, compact: bool = False) -> None:
+    if path.endswith((".ndjson", ".ndjson.gz")):
+        write_ndjson(coverage_records(reports), path)
+    else:
+        write_json(reports, path, compact=compact)
 
 # Example usage
 if __name__ == "__main__":
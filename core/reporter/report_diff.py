@@ -0,0 +1,225 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.parser.records import function_keys, get_docstring
+from core.reporter.report_writers import coverage_from_records, iter_ndjson
+
+# ---------------- Snapshots ----------------
+
+class Snapshot:
+    """
+    One run reduced to hashable keys, ready to diff.
+
+    functions:  (file, function key) -> has docstring
+    violations: (file, code, message) -> lines, so moved lines still match
+    files:      file -> (total functions, documented functions)
+
+    File paths are relative to the run's root, so runs of two checkouts
+    in different folders line up.
+    """
+
+    __slots__ = ("functions", "violations", "files")
+
+    def __init__(self):
+        self.functions: Dict[Tuple[str, str], bool] = {}
+        self.violations: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+        self.files: Dict[str, Tuple[int, int]] = {}
+
+
+def _relative(file_path: str, root: Optional[str]) -> str:
+    if root:
+        file_path = os.path.relpath(file_path, root)
+    return file_path.replace(os.sep, "/")
+
+def snapshot_from_results(parse_results: Iterable[Dict[str, Any]] = (),
+                          validation_results: Iterable[Dict[str, Any]] = (),
+                          coverage: Optional[Dict[str, Any]] = None,
+                          root: Optional[str] = None) -> Snapshot:
+    """Snapshot of parser results, validate_file results and/or a compute_coverage report."""
+    snapshot = Snapshot()
+    for file_path, entry in (coverage or {}).items():
+        if file_path != "overall":
+            snapshot.files[_relative(file_path, root)] = (entry["total_functions"], entry["functions_with_docstring"])
+
+    for result in parse_results:
+        file_path = _relative(result.get("file_path", "unknown"), root)
+        records = list(result.get("functions") or ())
+        documented = 0
+        for key, fn in zip(function_keys(records), records):
+            has_docstring = bool(get_docstring(fn))
+            snapshot.functions[(file_path, key)] = has_docstring
+            documented += has_docstring
+        snapshot.files[file_path] = (len(records), documented)
+
+    for result in validation_results:
+        file_path = _relative(result.get("file", "unknown"), root)
+        for v in result.get("formatting_violations", ()):
+            snapshot.violations[(file_path, v["code"], v.get("message") or "")].append(v.get("line"))
+    return snapshot
+
+def snapshot_from_run(store, run_id: int) -> Snapshot:
+    """Snapshot of a run kept in a HistoryStore."""
+    run = store.run(run_id)
+    if run is None:
+        raise ValueError(f"No run with id {run_id}")
+    root = run["root"]
+    snapshot = Snapshot()
+    for row in store.run_files(run_id):
+        snapshot.files[_relative(row["file_path"], root)] = (row["total_functions"], row["functions_with_docstring"])
+    for row in store.run_functions(run_id):
+        snapshot.functions[(_relative(row["file_path"], root), row["key"])] = bool(row["has_docstring"])
+    for row in store.run_violations(run_id):
+        key = (_relative(row["file_path"], root), row["code"], row["message"] or "")
+        snapshot.violations[key].append(row["line"])
+    return snapshot
+
+def load_snapshot(path: str, root: Optional[str] = None) -> Snapshot:
+    """
+    Snapshot of a report file. Accepted forms:
+
+    - a list of parser and/or validate_file results (JSON)
+    - {"parse_results": [...], "validation_results": [...]} (JSON)
+    - a compute_coverage report (JSON, or NDJSON from write_report)
+
+    Files ending in .gz (e.g. from write_json with compression) are
+    read through gzip.
+    """
+    if path.endswith((".ndjson", ".ndjson.gz")):
+        return snapshot_from_results(coverage=coverage_from_records(iter_ndjson(path)), root=root)
+    with (gzip.open(path, "rt", encoding="utf-8") if path.endswith(".gz") else open(path, "r")) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        parsed = [r for r in data if "functions" in r]
+        validated = [r for r in data if "file" in r]
+        return snapshot_from_results(parsed, validated, root=root)
+    if "parse_results" in data or "validation_results" in data:
+        return snapshot_from_results(data.get("parse_results", ()), data.get("validation_results", ()), root=root)
+    return snapshot_from_results(coverage=data, root=root)
+
+
+# ---------------- Diff ----------------
+
+def _percent(counts: Optional[Tuple[int, int]]) -> Optional[float]:
+    if counts is None:
+        return None
+    total, documented = counts
+    return round(documented / total * 100, 2) if total else 0
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Dict[str, Any]:
+    """
+    Compare two snapshots with hash joins on their keys (one pass each).
+
+    Returns lost/gained docstrings, added/removed functions, new/fixed
+    violations and the files whose coverage changed, plus overall totals.
+    """
+    lost, gained, added, removed = [], [], [], []
+    for key, has_docstring in new.functions.items():
+        before = old.functions.get(key)
+        if before is None:
+            added.append(key)
+        elif before and not has_docstring:
+            lost.append(key)
+        elif has_docstring and not before:
+            gained.append(key)
+    removed = [key for key in old.functions if key not in new.functions]
+
+    new_violations, fixed_violations = [], []
+    for key, lines in new.violations.items():
+        extra = len(lines) - len(old.violations.get(key, ()))
+        # The occurrences beyond the old count are the new ones; report the last
+        for line in lines[len(lines) - extra:] if extra > 0 else ():
+            new_violations.append({"file": key[0], "code": key[1], "line": line, "message": key[2]})
+    for key, lines in old.violations.items():
+        extra = len(lines) - len(new.violations.get(key, ()))
+        for line in lines[len(lines) - extra:] if extra > 0 else ():
+            fixed_violations.append({"file": key[0], "code": key[1], "line": line, "message": key[2]})
+
+    coverage = {}
+    for file_path in new.files.keys() | old.files.keys():
+        before, after = _percent(old.files.get(file_path)), _percent(new.files.get(file_path))
+        if before != after:
+            coverage[file_path] = {
+                "before": before,
+                "after": after,
+                "delta": round((after or 0) - (before or 0), 2),
+            }
+
+    def totals(snapshot):
+        return (sum(t for t, _ in snapshot.files.values()), sum(d for _, d in snapshot.files.values()))
+
+    overall_before, overall_after = _percent(totals(old)), _percent(totals(new))
+    as_function = lambda key: {"file": key[0], "function": key[1]}
+    return {
+        "lost_docstrings": [as_function(k) for k in sorted(lost)],
+        "gained_docstrings": [as_function(k) for k in sorted(gained)],
+        "added_functions": [as_function(k) for k in sorted(added)],
+        "removed_functions": [as_function(k) for k in sorted(removed)],
+        "new_violations": sorted(new_violations, key=lambda v: (v["file"], v["line"] or 0, v["code"])),
+        "fixed_violations": sorted(fixed_violations, key=lambda v: (v["file"], v["line"] or 0, v["code"])),
+        "coverage": dict(sorted(coverage.items())),
+        "overall": {
+            "before": overall_before,
+            "after": overall_after,
+            "delta": round(overall_after - overall_before, 2),
+        },
+    }
+
+def is_regression(diff: Dict[str, Any]) -> bool:
+    """True if a diff loses docstrings, adds violations or lowers overall coverage."""
+    return bool(diff["lost_docstrings"] or diff["new_violations"] or diff["overall"]["delta"] < 0)
+
+
+# ---------------- CLI ----------------
+
+def _format_text(diff: Dict[str, Any]) -> str:
+    overall = diff["overall"]
+    lines = [f"Coverage: {overall['before']}% -> {overall['after']}% ({overall['delta']:+})"]
+    for title, key in (("Lost docstrings", "lost_docstrings"), ("Gained docstrings", "gained_docstrings")):
+        if diff[key]:
+            lines.append(f"{title} ({len(diff[key])}):")
+            lines.extend(f"  {f['file']}::{f['function']}" for f in diff[key])
+    if diff["new_violations"]:
+        lines.append(f"New violations ({len(diff['new_violations'])}):")
+        lines.extend(f"  {v['file']}:{v['line']} {v['code']} {v['message']}" for v in diff["new_violations"])
+    if diff["fixed_violations"]:
+        lines.append(f"Fixed violations: {len(diff['fixed_violations'])}")
+    if diff["coverage"]:
+        lines.append("Per-file coverage:")
+        lines.extend(
+            f"  {path}: {c['before']} -> {c['after']} ({c['delta']:+})" for path, c in diff["coverage"].items()
+        )
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m core.reporter.report_diff",
+        description="Compare two reports (or two stored runs) and list regressions.",
+    )
+    parser.add_argument("old", help="old report file, or run id with --db")
+    parser.add_argument("new", help="new report file, or run id with --db")
+    parser.add_argument("--db", help="HistoryStore database; old/new are then run ids")
+    parser.add_argument("--old-root", help="folder the old report's paths are relative to")
+    parser.add_argument("--new-root", help="folder the new report's paths are relative to")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 if docstrings were lost, violations added or coverage dropped")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        from core.history.history_store import HistoryStore
+        with HistoryStore(args.db) as store:
+            diff = diff_snapshots(snapshot_from_run(store, int(args.old)), snapshot_from_run(store, int(args.new)))
+    else:
+        diff = diff_snapshots(load_snapshot(args.old, args.old_root), load_snapshot(args.new, args.new_root))
+
+    print(json.dumps(diff, indent=2) if args.format == "json" else _format_text(diff))
+    return 1 if args.fail_on_regression and is_regression(diff) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
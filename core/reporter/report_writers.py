@@ -0,0 +1,215 @@
+import gzip
+import json
+import os
+from itertools import islice
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "AI Code Reviewer"
+
+# No whitespace between tokens; roughly a third of indent=4 output
+_COMPACT = (",", ":")
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# ---------------- Files ----------------
+
+# Text handle for writing; gzip when asked to or when the path ends in .gz
+def _open_write(path: str, compress: Optional[bool] = None) -> IO[str]:
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+# Text handle for reading; gzip is detected from the file itself
+def _open_read(path: str) -> IO[str]:
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == _GZIP_MAGIC:
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+# ---------------- Coverage Records ----------------
+
+# One record per file, then the overall totals, from a compute_coverage report
+def coverage_records(report: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for file_path, entry in report.items():
+        if file_path != "overall":
+            yield dict(entry, type="file", file_path=file_path)
+    if "overall" in report:
+        yield dict(report["overall"], type="overall")
+
+# compute_coverage report rebuilt from coverage_records output
+def coverage_from_records(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    report = {}
+    for record in records:
+        entry = {k: v for k, v in record.items() if k not in ("type", "file_path")}
+        report["overall" if record.get("type") == "overall" else record["file_path"]] = entry
+    return report
+
+
+# ---------------- Writers ----------------
+
+class NDJSONWriter:
+    """
+    Writes one compact JSON record per line as records arrive.
+
+    Nothing is buffered beyond the file object's own buffer, so memory
+    stays flat however large the report gets. Paths ending in .gz (or
+    compress=True) are gzip-compressed.
+    """
+
+    def __init__(self, path: str, compress: Optional[bool] = None):
+        self.path = path
+        self.count = 0
+        self._file = _open_write(path, compress)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=_COMPACT))
+        self._file.write("\n")
+        self.count += 1
+
+    def write_all(self, records: Iterable[Dict[str, Any]]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "NDJSONWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SARIFWriter:
+    """
+    Streams violations into a SARIF 2.1.0 log for code-scanning tools.
+
+    Results are written as they are added; only the distinct rule codes
+    are kept in memory, to emit the tool's rule list when the log is
+    closed. Violations use the validator's shape: {"code", "line",
+    "message"} with an optional "column".
+    """
+
+    def __init__(self, path: str, tool_name: str = TOOL_NAME, root: Optional[str] = None,
+                 compress: Optional[bool] = None, level: str = "warning"):
+        self.path = path
+        self.root = root
+        self.level = level
+        self.count = 0
+        self.tool_name = tool_name
+        self._rules: Dict[str, str] = {}
+        self._file = _open_write(path, compress)
+        self._file.write(f'{{"version":"{SARIF_VERSION}","$schema":"{SARIF_SCHEMA}","runs":[{{"results":[')
+
+    def _uri(self, file_path: str) -> str:
+        if self.root:
+            file_path = os.path.relpath(file_path, self.root)
+        return file_path.replace(os.sep, "/")
+
+    def add(self, file_path: str, violation: Dict[str, Any]) -> None:
+        code = violation.get("code") or "unknown"
+        message = violation.get("message") or code
+        self._rules.setdefault(code, message)
+
+        region = {"startLine": max(int(violation.get("line") or 1), 1)}
+        if violation.get("column"):
+            region["startColumn"] = int(violation["column"])
+        result = {
+            "ruleId": code,
+            "level": self.level,
+            "message": {"text": message},
+            "locations": [{"physicalLocation": {
+                "artifactLocation": {"uri": self._uri(file_path)},
+                "region": region,
+            }}],
+        }
+        if self.count:
+            self._file.write(",")
+        self._file.write(json.dumps(result, separators=_COMPACT))
+        self.count += 1
+
+    def add_all(self, violations: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        for file_path, violation in violations:
+            self.add(file_path, violation)
+        return self.count
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        rules = [{"id": code, "shortDescription": {"text": text}} for code, text in sorted(self._rules.items())]
+        driver = {"name": self.tool_name, "rules": rules}
+        self._file.write("],")
+        self._file.write(json.dumps({"tool": {"driver": driver}}, separators=_COMPACT)[1:-1])
+        self._file.write("}]}")
+        self._file.close()
+
+    def __enter__(self) -> "SARIFWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# (file, violation) pairs from validate_file results, for SARIFWriter.add_all
+def validation_violations(results: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for result in results:
+        file_path = result.get("file", "unknown")
+        if result.get("parse_error"):
+            yield file_path, {"code": "E999", "line": 1, "message": result.get("error", "File could not be parsed")}
+        for violation in result.get("docstring_violations", ()):
+            yield file_path, violation
+        for violation in result.get("formatting_violations", ()):
+            yield file_path, violation
+
+def write_ndjson(records: Iterable[Dict[str, Any]], path: str, compress: Optional[bool] = None) -> int:
+    with NDJSONWriter(path, compress) as writer:
+        return writer.write_all(records)
+
+def write_sarif(violations: Iterable[Tuple[str, Dict[str, Any]]], path: str, root: Optional[str] = None,
+                compress: Optional[bool] = None) -> int:
+    with SARIFWriter(path, root=root, compress=compress) as writer:
+        return writer.add_all(violations)
+
+def write_json(report: Dict[str, Any], path: str, compact: bool = True, compress: Optional[bool] = None) -> None:
+    """json.dump of a whole report; compact drops all insignificant whitespace."""
+    with _open_write(path, compress) as f:
+        if compact:
+            json.dump(report, f, separators=_COMPACT)
+        else:
+            json.dump(report, f, indent=4)
+
+
+# ---------------- Readers ----------------
+
+def iter_ndjson(path: str, start: int = 0, stop: Optional[int] = None,
+                where: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Records of an NDJSON report (plain or gzip), read lazily.
+
+    start/stop slice by line number; lines outside the slice are skipped
+    without being decoded. `where` then filters the decoded records.
+    """
+    with _open_read(path) as f:
+        for line in islice(f, start, stop):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if where is None or where(record):
+                yield record
+
+def read_slice(path: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    return list(iter_ndjson(path, offset, offset + limit))
+
+# Number of records, counted without decoding any of them
+def count_records(path: str) -> int:
+    with _open_read(path) as f:
+        return sum(1 for line in f if line.strip())
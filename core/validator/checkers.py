@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+from core.analysis.context import AnalysisContext
+
+# What a checker can ask the context for; each is built once, before any
+# checker starts, so concurrent checkers never race to build it
+NEEDS = frozenset({"source", "lines", "tokens", "ast"})
+
+
+class Checker(NamedTuple):
+    name: str
+    run: Callable[[AnalysisContext, Dict[str, Any]], Any]
+    needs: FrozenSet[str]
+    count: Callable[[Any], int]
+
+
+CHECKERS: Dict[str, Checker] = {}
+
+def register_checker(name: str, needs: Iterable[str] = ("source",), count: Callable[[Any], int] = len):
+    """
+    Register a validate_file check under `name`.
+
+    The check is called as check(context, options) and may only use the
+    parts of the context listed in `needs` ("source", "lines", "tokens",
+    "ast"). Checkers that need "ast" or "tokens" are skipped when the
+    source does not parse or tokenize. `count` turns the result into the
+    number reported alongside the checker's timing.
+    """
+    needs = frozenset(needs)
+    unknown = needs - NEEDS
+    if unknown:
+        raise ValueError(f"Unknown checker needs: {sorted(unknown)}")
+
+    def register(check):
+        CHECKERS[name] = Checker(name, check, needs, count)
+        return check
+    return register
+
+
+# ---------------- Runner ----------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# One thread pool per process, shared by every validate_file call
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="checker")
+        return _pool
+
+def _forget_pool() -> None:
+    global _pool, _pool_lock
+    _pool, _pool_lock = None, threading.Lock()
+
+# A forked worker (validate_folder's process pool) inherits the pool object
+# but not its threads; give it a fresh one
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pool)
+
+# Build what the checkers need; returns the needs that are unavailable
+def _prepare(context: AnalysisContext, needs: FrozenSet[str]) -> Dict[str, str]:
+    missing = {}
+    if "lines" in needs or "tokens" in needs:
+        context.lines
+    if "ast" in needs and context.parse_error is not None:
+        missing["ast"] = str(context.parse_error)
+    if "tokens" in needs:
+        try:
+            context.tokens
+        except Exception as e:
+            missing["tokens"] = str(e)
+    return missing
+
+def _timed(checker: Checker, context: AnalysisContext, options: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        result = checker.run(context, options)
+        outcome = {"result": result, "count": checker.count(result)}
+    except Exception as e:
+        outcome = {"result": None, "count": -1, "error": str(e)}
+    outcome["seconds"] = time.perf_counter() - start
+    return outcome
+
+def run_checkers(context: AnalysisContext, names: Optional[Iterable[str]] = None,
+                 options: Optional[Dict[str, Any]] = None, concurrent: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Run registered checkers (all by default) over one context.
+
+    Checkers run concurrently on a shared thread pool unless
+    concurrent=False. Returns {name: {"result", "count", "seconds"}}, in
+    registration order. A checker that raises gets "error" and count -1.
+    One whose needs are unavailable gets "skipped" and count 0.
+    """
+    options = options or {}
+    selected: List[Checker] = [CHECKERS[n] for n in names] if names is not None else list(CHECKERS.values())
+    missing = _prepare(context, frozenset().union(*(c.needs for c in selected)))
+
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    runnable = []
+    for checker in selected:
+        unavailable = checker.needs & missing.keys()
+        if unavailable:
+            need = sorted(unavailable)[0]
+            outcomes[checker.name] = {"result": None, "count": 0, "seconds": 0.0,
+                                      "skipped": f"{need} unavailable: {missing[need]}"}
+        else:
+            runnable.append(checker)
+
+    if concurrent and len(runnable) > 1:
+        futures = [(c.name, _executor().submit(_timed, c, context, options)) for c in runnable]
+        for name, future in futures:
+            outcomes[name] = future.result()
+    else:
+        for checker in runnable:
+            outcomes[checker.name] = _timed(checker, context, options)
+    return {c.name: outcomes[c.name] for c in selected}
@@ -1,70 +1,127 @@
 import ast
 import os
-from typing import Any, List, Dict
-import autopep8
-import pydocstyle
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, List, Dict, Optional
+import pycodestyle
 import streamlit as st
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
+
+from core.analysis.context import AnalysisContext
+from core.metrics.engine import analyze_metrics
+from core.validator.checkers import register_checker, run_checkers
+from core.validator.docstring_rules import check_context
+from core.parser.python_parser import iter_python_files
 
 # --- METRIC FUNCTIONS ---
+# Thin views over core.metrics.engine.analyze_metrics; call the engine
+# directly when more than one metric is needed for the same code.
 def compute_complexity_from_string(code: str) -> dict:
     """Analyze code string directly to avoid path issues."""
-    try:
-        analysis = cc_visit(code)
-        if not analysis:
-            return {"info": "No functions found"}
-        return {item.name: item.complexity for item in analysis if item.is_function}
-    except Exception as e:
-        return {"error": str(e)}
-
-import ast
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
+    metrics = analyze_metrics(code)
+    if "error" in metrics:
+        return {"error": metrics["error"]}
+    if not metrics["functions"]:
+        return {"info": "No functions found"}
+    return {fn["name"]: fn["complexity"] for fn in metrics["functions"]}
 
 def summarize_complexity(code: str) -> dict:
     """Analyze complexity directly from a string of code."""
-    try:
-        # cc_visit returns a list of Function objects
-        analysis = cc_visit(code)
-        
-        if not analysis:
-            return {"info": "No functions found"}
-
-        # Filter only for functions/methods
-        complexity_map = {item.name: item.complexity for item in analysis if hasattr(item, 'complexity')}
-        
-        if not complexity_map:
-            return {"info": "No functions found"}
-
-        values = list(complexity_map.values())
-        max_val = max(values)
-        
-        return {
-            "total_functions": len(values),
-            "average_complexity": round(sum(values) / len(values), 2),
-            "max_complexity": max_val,
-            "risk_level": "Low" if max_val <= 5 else "Medium" if max_val <= 10 else "High",
-            "per_function": complexity_map
-        }
-    except Exception as e:
-        return {"error": str(e)}
+    metrics = analyze_metrics(code)
+    if "error" in metrics:
+        return {"error": metrics["error"]}
+    return metrics["complexity"]
 
 def compute_maintainability_single(code: str) -> dict:
     """Computes Maintainability Index from a string of code."""
-    try:
-        # mi_visit returns a score (0-100)
-        mi_score = mi_visit(code, multi=True)
-        return {
-            "score": round(mi_score, 2),
-            "status": "Good" if mi_score >= 70 else "Average" if mi_score >= 50 else "Poor"
-        }
-    except Exception as e:
+    metrics = analyze_metrics(code)
+    if "error" in metrics:
         return {"score": 0, "status": "Error"}
+    return metrics["maintainability"]
     
-def validate_file(file_path: str) -> Dict:
+# Codes validate_docstrings reports by default: public definitions
+# without a docstring (modules excluded)
+MISSING_DOCSTRING_CODES = ("D101", "D102", "D103", "D105", "D106", "D107", "D419")
+
+class _CapReached(Exception):
+    pass
+
+# pycodestyle report that records violations and stops the run at a cap
+class _CollectingReport(pycodestyle.BaseReport):
+    def __init__(self, options, cap: Optional[int] = None):
+        super().__init__(options)
+        self.cap = cap
+        self.violations = []
+
+    def error(self, line_number, offset, text, check):
+        code = super().error(line_number, offset, text, check)
+        if code:
+            self.violations.append({
+                "code": code,
+                "line": line_number,
+                "column": offset + 1,
+                "message": text[5:]
+            })
+            if self.cap is not None and len(self.violations) >= self.cap:
+                raise _CapReached()
+        return code
+
+_style_options = None
+
+def check_formatting(context: AnalysisContext, max_violations: Optional[int] = None) -> List[Dict]:
+    """
+    Report style violations (pycodestyle defaults) without rewriting the code.
+
+    Returns [{"code", "line", "column", "message"}]; stops as soon as
+    `max_violations` have been found.
+    """
+    global _style_options
+    if _style_options is None:
+        _style_options = pycodestyle.StyleGuide(quiet=True).options
+
+    report = _CollectingReport(_style_options, max_violations)
+    checker = pycodestyle.Checker(lines=context.lines, options=_style_options, report=report)
+    try:
+        checker.check_all()
+    except _CapReached:
+        pass
+    return report.violations
+
+# ---------------- Built-in Checkers ----------------
+
+# Top-level functions, and the ones without a docstring
+@register_checker("docstrings", needs=("ast",), count=lambda r: len(r["missing"]))
+def _check_docstrings(context: AnalysisContext, options: Dict) -> Dict:
+    functions = [node for node in context.tree.body if isinstance(node, ast.FunctionDef)]
+    return {
+        "total": len(functions),
+        "missing": [fn.name for fn in functions if not ast.get_docstring(fn)]
+    }
+
+@register_checker("pep257", needs=("ast", "lines"))
+def _check_pep257(context: AnalysisContext, options: Dict) -> List[Dict]:
+    return check_context(context)
+
+@register_checker("formatting", needs=("lines",))
+def _check_formatting(context: AnalysisContext, options: Dict) -> List[Dict]:
+    return check_formatting(context, options.get("max_formatting_issues"))
+
+_BUILTIN_CHECKERS = ("docstrings", "pep257", "formatting")
+
+def validate_file(file_path: str, context: AnalysisContext = None,
+                  max_formatting_issues: Optional[int] = None,
+                  checkers: Optional[List[str]] = None, concurrent: bool = True) -> Dict:
     """
     Validate a Python file for code quality.
+
+    Every check reads from one AnalysisContext, so the file is read and
+    parsed once; pass `context` to share it with other stages. Checks come
+    from the checker registry (core.validator.checkers); `checkers` picks
+    which to run (all registered by default). They run concurrently unless
+    concurrent=False.
+    Formatting is checked in detect-only mode; `max_formatting_issues`
+    stops that check early once the cap is reached.
     
     Returns a dictionary:
     {
@@ -73,7 +130,11 @@ def validate_file(file_path: str) -> Dict:
         "missing_docstrings": int,
         "total_functions": int,
         "pep257_violations": int,
-        "formatting_issues": int
+        "docstring_violations": [{"code", "line", "message", "definition"}],   # the PEP-257 ones
+        "formatting_issues": int,
+        "formatting_violations": [{"code", "line", "column", "message"}],
+        "checkers": {name: {"seconds", "count"}},
+        "extra_checks": {name: result}   # registered checkers beyond the built-ins
     }
     """
     results = {
@@ -82,76 +143,129 @@ def validate_file(file_path: str) -> Dict:
         "missing_docstrings": 0,
         "total_functions": 0,
         "pep257_violations": 0,
-        "formatting_issues": 0
+        "docstring_violations": [],
+        "formatting_issues": 0,
+        "formatting_violations": [],
+        "checkers": {},
+        "extra_checks": {}
     }
 
-    # Read file content
-    with open(file_path, "r") as f:
-        code = f.read()
+    if context is None:
+        context = AnalysisContext.from_file(file_path)
 
     # ---------------- PARSE ERROR ----------------
-    try:
-        tree = ast.parse(code)
-    except Exception:
+    if context.parse_error is not None:
         results["parse_error"] = True
         return results  # cannot proceed if parsing fails
 
+    outcomes = run_checkers(context, checkers, {"max_formatting_issues": max_formatting_issues}, concurrent)
+    for name, outcome in outcomes.items():
+        results["checkers"][name] = {
+            key: outcome[key] for key in ("seconds", "count", "error", "skipped") if key in outcome
+        }
+        if name not in _BUILTIN_CHECKERS:
+            results["extra_checks"][name] = outcome["result"]
+
     # ---------------- DOCSTRING CHECK ----------------
-    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef)]
-    results["total_functions"] = len(functions)
-    for fn in functions:
-        if not ast.get_docstring(fn):
-            results["missing_docstrings"] += 1
+    docstrings = outcomes.get("docstrings")
+    if docstrings and docstrings["result"] is not None:
+        results["total_functions"] = docstrings["result"]["total"]
+        results["missing_docstrings"] = docstrings["count"]
 
     # ---------------- PEP-257 CHECK ----------------
-    try:
-        pep_issues = list(pydocstyle.check([file_path]))
-        results["pep257_violations"] = len(pep_issues)
-    except Exception:
-        results["pep257_violations"] = -1  # failed to check
+    if "pep257" in outcomes:
+        results["pep257_violations"] = outcomes["pep257"]["count"]  # -1 if the check failed
+        results["docstring_violations"] = outcomes["pep257"]["result"] or []
 
     # ---------------- FORMATTING ISSUES ----------------
-    try:
-        formatted_code = autopep8.fix_code(code, options={'aggressive': 1})
-        if formatted_code != code:
-            results["formatting_issues"] = 1  # indicates code needs formatting
-    except Exception:
-        results["formatting_issues"] = -1  # failed to check
+    if "formatting" in outcomes:
+        formatting = outcomes["formatting"]
+        results["formatting_issues"] = formatting["count"]  # -1 if the check failed
+        results["formatting_violations"] = formatting["result"] or []
 
     return results
 
 
-def validate_folder(folder_path: str) -> List[Dict]:
+class _FileTimeout(BaseException):
+    """Raised in a worker when a file exceeds its budget (BaseException so
+    the per-check `except Exception` handlers cannot swallow it)."""
+
+def _raise_timeout(signum, frame):
+    raise _FileTimeout()
+
+# Validate one file within a wall-clock budget. The budget is enforced with
+# SIGALRM, so it needs a Unix main thread and interrupts pure-Python work only.
+def _validate_with_budget(file_path: str, timeout: Optional[float]) -> Dict:
+    use_alarm = (
+        timeout is not None
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        # Checkers run in this thread so the alarm can interrupt them
+        return validate_file(file_path, concurrent=not use_alarm)
+    except _FileTimeout:
+        return {
+            "file": file_path,
+            "parse_error": False,
+            "missing_docstrings": 0,
+            "total_functions": 0,
+            "pep257_violations": -1,
+            "docstring_violations": [],
+            "formatting_issues": -1,
+            "formatting_violations": [],
+            "checkers": {},
+            "extra_checks": {},
+            "timed_out": True
+        }
+    except (OSError, SyntaxError, ValueError) as e:
+        # Unreadable or undecodable (e.g. not UTF-8): one failed file, not a failed run
+        return {"file": file_path, "parse_error": True, "error": str(e)}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+def validate_folder(folder_path: str, recursive: bool = False, workers: Optional[int] = None,
+                    timeout: Optional[float] = None, chunksize: int = 4) -> List[Dict]:
     """
     Validate all Python files in a folder.
-    Returns a list of results for each file.
+    Returns a list of results for each file, in a stable order
+    (sorted names, each folder's files before its sub-folders).
+
+    recursive=True descends into sub-folders (skipping VCS, cache and
+    virtualenv folders) and spreads files over a process pool of `workers`
+    processes (one per CPU by default; 1 validates in this process). A
+    single folder is validated in this process unless `workers` is given. A file
+    that runs longer than `timeout` seconds is recorded with
+    "timed_out": True instead of stalling the batch.
     """
-    results_list = []
-    import os
-    for f in os.listdir(folder_path):
-        if f.endswith(".py"):
-            file_path = os.path.join(folder_path, f)
-            results_list.append(validate_file(file_path))
-    return results_list
-
-def validate_docstrings(file_path):
-    violations = []
-
-    # example dummy check (replace with real pydocstyle later)
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+    if recursive:
+        files = list(iter_python_files(folder_path))
+    else:
+        files = [os.path.join(folder_path, f) for f in sorted(os.listdir(folder_path)) if f.endswith(".py")]
 
-        for i, line in enumerate(lines, start=1):
-            if line.strip().startswith("def ") and i < len(lines) and '"""' not in lines[i]:
+    # A single folder stays serial unless asked, as it was before the pool
+    if workers == 1 or len(files) <= 1 or (workers is None and not recursive):
+        return [_validate_with_budget(path, timeout) for path in files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_validate_with_budget, files, repeat(timeout), chunksize=chunksize))
 
-                violations.append({
-                    "code": "D103",
-                    "line": i,
-                    "message": "Missing docstring"
-                })
+def validate_docstrings(file_path, context: AnalysisContext = None, select=MISSING_DOCSTRING_CODES):
+    """
+    PEP-257 docstring violations of one file.
 
-    except Exception as e:
+    Runs the AST rule engine (core.validator.docstring_rules) with the
+    `select` codes or prefixes; pass select=None for every rule. Returns
+    [{"code", "line", "message", "definition"}], or [] if the file cannot
+    be read or parsed.
+    """
+    try:
+        if context is None:
+            context = AnalysisContext.from_file(file_path)
+        return check_context(context, select)
+    except (OSError, SyntaxError, ValueError):
         return []
-
-    return violations
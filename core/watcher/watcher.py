@@ -0,0 +1,301 @@
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from core.analysis.context import AnalysisContext
+from core.parser.python_parser import SKIP_DIRS, iter_python_files, parse_tree
+from core.validator.validator import validate_file
+
+# ---------------- Change Sources ----------------
+
+# inotify event bits (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+               | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class PollingSource:
+    """
+    Finds changed .py files by comparing (mtime, size) snapshots.
+
+    Works everywhere; each read costs one walk of the tree, so keep the
+    interval well above the time a walk takes.
+    """
+
+    def __init__(self, root: str, interval: float = 1.0):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for path in iter_python_files(self.root):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        """Paths changed since the last read; waits up to `timeout` seconds."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snapshot = self._scan()
+        old = self._snapshot
+        self._snapshot = snapshot
+        changed = {p for p, stamp in snapshot.items() if old.get(p) != stamp}
+        changed.update(p for p in old if p not in snapshot)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifySource:
+    """
+    Linux inotify watches on every folder of the tree (via libc, no extra
+    dependency). Reads return the paths named by events, which may be
+    folders; None means the kernel queue overflowed and everything must
+    be rescanned.
+    """
+
+    def __init__(self, root: str):
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.root = root
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+        self._watch_tree(root)
+
+    def _watch(self, folder: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), _WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = folder
+
+    # Watch a folder and its sub-folders; returns the .py files found in it
+    def _watch_tree(self, folder: str) -> List[str]:
+        found = []
+        for dirpath, dirnames, filenames in os.walk(folder):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            self._watch(dirpath)
+            found.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".py"))
+        return found
+
+    def read(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: Set[str] = set()
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            folder = self._dirs.get(wd)
+            if folder is None:
+                continue
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            path = os.path.join(folder, name) if name else folder
+            if mask & _IN_ISDIR:
+                if name in SKIP_DIRS:
+                    continue
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # Files may land in a new folder before it is watched
+                    changed.update(self._watch_tree(path))
+                changed.add(path)
+            elif name.endswith(".py") or not name:
+                changed.add(path)
+        return None if overflow else changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_source(root: str, backend: str = "auto", poll_interval: float = 1.0):
+    """inotify where the platform has it ("auto"/"inotify"), else polling."""
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifySource(root)
+        except OSError:
+            if backend == "inotify":
+                raise
+    elif backend == "inotify":
+        raise OSError("inotify is only available on Linux")
+    return PollingSource(root, poll_interval)
+
+
+# ---------------- Watcher ----------------
+
+class Watcher:
+    """
+    Keeps validation and parse results for a tree up to date.
+
+    scan() analyzes every file once; poll() waits for changes, lets a burst
+    of saves settle for `debounce` seconds, then re-runs validate_file and
+    the parser on the changed files only. Both return a delta:
+    {"changed": {path: {"validation", "functions"}}, "removed": [paths]}.
+    A file whose contents are unchanged (touched, or saved twice) is not
+    re-analyzed and does not appear in the delta.
+    """
+
+    def __init__(self, root: str, debounce: float = 0.2, poll_interval: float = 1.0,
+                 backend: str = "auto", validate: bool = True, parse: bool = True):
+        if not os.path.isdir(root):
+            raise ValueError(f"Not a directory: {root}")
+        self.root = root
+        self.debounce = debounce
+        self.validate = validate
+        self.parse = parse
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._digests: Dict[str, str] = {}
+        self._source = open_source(root, backend, poll_interval)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if isinstance(self._source, InotifySource) else "polling"
+
+    def _analyze(self, path: str, content: bytes) -> Dict[str, Any]:
+        result = {}
+        try:
+            context = AnalysisContext(content.decode("utf-8"), path)
+        except UnicodeDecodeError as e:
+            return {"error": str(e)}
+        if self.validate:
+            result["validation"] = validate_file(path, context=context)
+        if self.parse:
+            if context.parse_error is not None:
+                result["functions"] = None
+                result["error"] = str(context.parse_error)
+            else:
+                result["functions"] = parse_tree(context.tree)
+        return result
+
+    # Re-check the given paths (files or folders) and build the delta
+    def _refresh(self, paths: Iterable[str]) -> Dict[str, Any]:
+        files: Set[str] = set()
+        removed: List[str] = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.update(iter_python_files(path))
+            elif os.path.isfile(path):
+                if path.endswith(".py"):
+                    files.add(path)
+            else:
+                # Gone: the file itself, or everything under a removed folder
+                prefix = path.rstrip(os.sep) + os.sep
+                for known in [p for p in self.results if p == path or p.startswith(prefix)]:
+                    del self.results[known]
+                    self._digests.pop(known, None)
+                    removed.append(known)
+
+        changed = {}
+        for path in sorted(files):
+            try:
+                with open(path, "rb") as f:
+                    content = f.read()
+            except OSError:
+                continue  # removed again before we got to it; the next event reports it
+            digest = hashlib.sha1(content).hexdigest()
+            if self._digests.get(path) == digest:
+                continue
+            self._digests[path] = digest
+            self.results[path] = changed[path] = self._analyze(path, content)
+        return {"changed": changed, "removed": sorted(removed)}
+
+    def scan(self) -> Dict[str, Any]:
+        """Analyze the whole tree; every file is reported as changed."""
+        return self._refresh([self.root] + list(self.results))
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait up to `timeout` seconds (forever if None) for changes and
+        return their delta, or None if nothing changed.
+        """
+        paths = self._source.read(timeout)
+        if paths is not None and not paths:
+            return None
+        # Debounce: keep collecting until the tree is quiet
+        while paths is not None:
+            more = self._source.read(self.debounce)
+            if more is None:
+                paths = None
+            elif not more:
+                break
+            else:
+                paths |= more
+        if paths is None:
+            paths = {self.root} | set(self.results)  # lost events: rescan everything
+        delta = self._refresh(paths)
+        if not delta["changed"] and not delta["removed"]:
+            return None
+        return delta
+
+    def watch(self, callback: Callable[[Dict[str, Any]], None], should_stop: Callable[[], bool] = None,
+              timeout: float = 1.0) -> None:
+        """Call `callback` with each delta until `should_stop()` returns True."""
+        while should_stop is None or not should_stop():
+            delta = self.poll(timeout)
+            if delta is not None:
+                callback(delta)
+
+    def close(self) -> None:
+        self._source.close()
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------- Example Usage ----------------
+if __name__ == "__main__":
+    import json
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    with Watcher(folder) as watcher:
+        initial = watcher.scan()
+        print(f"Watching {folder} ({watcher.backend}), {len(initial['changed'])} files analyzed")
+        try:
+            watcher.watch(lambda delta: print(json.dumps({
+                "changed": sorted(delta["changed"]),
+                "removed": delta["removed"],
+            })))
+        except KeyboardInterrupt:
+            pass
@@ -1,10 +1,14 @@
 import streamlit as st
 import os
-import ast
 import pandas as pd
 import json
 from collections import defaultdict
 
+from core.parser.fast_coverage import coverage_functions
+from core.parser.records import get_docstring, get_name
+from core.history.history_store import DEFAULT_HISTORY_PATH, HistoryStore
+from core.reporter.report_writers import count_records, read_slice
+
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(
     page_title="AI Code Dashboard",
@@ -35,21 +39,45 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ---------------- HELPERS ----------------
+# Table rows from parser output (dicts, FunctionRecords or a FunctionTable)
+def function_rows(functions):
+    return [
+        {"Function": get_name(fn), "Docstring": "Yes" if get_docstring(fn) else "No"}
+        for fn in functions
+    ]
+
 def get_functions(file_path):
-    rows = []
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             code = f.read().strip()
         if not code: return []
         code = "\n".join(line for line in code.splitlines() if not line.strip().startswith("```"))
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                doc = ast.get_docstring(node)
-                rows.append({"Function": node.name, "Docstring": "Yes" if doc else "No"})
+        return function_rows(coverage_functions(file_content=code, check_syntax=True))
     except (SyntaxError, Exception):
         return []
-    return rows
+
+# One page of an NDJSON report (plain or .gz); only that page is decoded
+def load_report_page(path, page=0, page_size=50):
+    try:
+        return pd.DataFrame(read_slice(path, page * page_size, page_size))
+    except (OSError, ValueError):
+        return pd.DataFrame()
+
+def find_report(candidates=("storage/reports/coverage.ndjson", "storage/reports/coverage.ndjson.gz")):
+    return next((p for p in candidates if os.path.exists(p)), None)
+
+# Coverage per package (columns) for each stored run (rows) of the last `days` days
+def load_coverage_history(path=DEFAULT_HISTORY_PATH, days=90):
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    with HistoryStore(path) as store:
+        rows = store.coverage_by_package(days)
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    df["Run"] = pd.to_datetime(df["started_at"], unit="s")
+    df["package"] = df["package"].replace("", "(root)")
+    return df.pivot_table(index="Run", columns="package", values="coverage_percent")
 
 # ---------------- DATA LOADING ----------------
 rows = []
@@ -153,6 +181,19 @@ def dashboard():
         st.info("No test report found. Run pytest to see results.")
         st.code('pytest tests/ --json-report --json-report-file=storage/reports/pytest_results.json -v', language='bash')
 
+    report_path = find_report()
+    if report_path:
+        with st.expander("📄 Coverage Report"):
+            page_size = 50
+            pages = max(1, -(-count_records(report_path) // page_size))
+            page = st.number_input("Page", min_value=1, max_value=pages, value=1) - 1
+            st.dataframe(load_report_page(report_path, page, page_size), use_container_width=True, hide_index=True)
+
+    history = load_coverage_history()
+    if not history.empty:
+        st.subheader("📈 Coverage by Package (last 90 days)")
+        st.line_chart(history)
+
     # Tabs Section
     st.markdown("---")
     tab1, tab2, tab3, tab4 = st.tabs(["🔍 Advanced Filter", "🔎 Search", "📤 Export", "💡 Help & Tips"])
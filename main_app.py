@@ -8,9 +8,14 @@ import json
 
 from core.reporter.coverage_reporter import compute_coverage, write_report
 from dashboard.dashboard import dashboard
-from core.parser.python_parser import parse_path
-from core.validator.validator import summarize_complexity, validate_docstrings, compute_maintainability_single
-from core.docstring_engine.groq_integration import generate_placeholder_docstring
+from core.parser.incremental import IncrementalAnalyzer
+from core.parser.fast_coverage import coverage_functions
+from core.parser.python_parser import parse_function
+from core.parser.symbol_index import iter_symbols
+from core.validator.validator import validate_docstrings
+from core.metrics.engine import analyze_metrics
+from core.docstring_engine.groq_integration import fn_info_of, generate_docstrings
+from core.docstring_engine.llm_cache import LLMCache
 # ------------------ PAGE CONFIG ------------------
 st.set_page_config(page_title="AI Code Reviewer", layout="wide", page_icon="🔍")
 
@@ -171,6 +176,8 @@ def insert_docstring_clean(code: str, node, docstring: str) -> str:
 # ------------------ SESSION STATE ------------------
 for key in ["scanned","code","file_name","page","updated_code"]:
     if key not in st.session_state: st.session_state[key] = False if key=="scanned" else "" if key=="code" else None
+if "analyzer" not in st.session_state: st.session_state.analyzer = IncrementalAnalyzer()
+analyzer = st.session_state.analyzer
 
 # ------------------ SIDEBAR ------------------
 st.sidebar.markdown(
@@ -206,7 +213,11 @@ funcs = []
 cleaned_code = ""
 if st.session_state.scanned and st.session_state.code:
     cleaned_code = clean_code(st.session_state.code)
-    try: funcs = parse_path(file_content=cleaned_code)
+    # Home only shows coverage numbers, which the fast scanner provides;
+    # other pages re-analyze only functions edited since the last rerun
+    try:
+        if st.session_state.page == "🏠 Home": funcs = coverage_functions(file_content=cleaned_code, check_syntax=True)
+        else: funcs = analyzer.update(cleaned_code)
     except Exception as e: st.error(f"Syntax error: {e}"); st.stop()
 
 parsed_files = []
@@ -275,29 +286,36 @@ elif page == "📝 Docstring":
         st.stop()
 
     current_code = st.session_state.get("updated_code", st.session_state.get("code", ""))
-    tree = ast.parse(current_code)
-    functions = [n for n in tree.body if isinstance(n, ast.FunctionDef)]
-    names = [f.name for f in functions]
+    # The analyzer holds the cleaned code. Its tree fits current_code unless the
+    # code was edited since, or clean_code dropped ``` lines and shifted lines
+    cleaned_current = clean_code(current_code)
+    same_lines = len(cleaned_current.splitlines()) == len(current_code.splitlines())
+    tree = analyzer.tree if analyzer.source == cleaned_current and same_lines else ast.parse(current_code)
+    # Methods, nested and async functions included, keyed by qualified name
+    functions = {name: n for name, n in iter_symbols(tree) if not isinstance(n, ast.ClassDef)}
+    names = list(functions)
 
     if not names:
         st.warning("No functions found.")
         st.stop()
 
     selected = st.selectbox("Select a function to review", names)
-    node = next((f for f in functions if f.name == selected), None)
+    node = functions[selected]
+
+    regenerate = st.button("🔄 Regenerate", help="Ask the model again instead of reusing a cached answer")
 
     # Generate placeholder docstrings once per selection
-    if st.session_state.get("last_selected") != selected:
+    if regenerate or st.session_state.get("last_selected") != selected:
         st.session_state.last_selected = selected
-        fn_info = {
-            "name": node.name,
-            "args": [{"name": arg.arg, "annotation": ast.unparse(arg.annotation) if arg.annotation else None} for arg in node.args.args],
-            "returns": ast.unparse(node.returns) if node.returns else None,
-        }
+        fn_info = fn_info_of(parse_function(node))
 
-        st.session_state.google_doc = generate_placeholder_docstring(fn_info, "google")
-        st.session_state.numpy_doc  = generate_placeholder_docstring(fn_info, "numpy")
-        st.session_state.rest_doc   = generate_placeholder_docstring(fn_info, "rest")
+        # One LLM call; the three styles are rendered locally from its content
+        # Signatures answered before (by anyone sharing the cache file) skip the LLM
+        with LLMCache() as cache:
+            docs = generate_docstrings(fn_info, ("google", "numpy", "rest"), cache=cache, bypass_cache=regenerate)
+        st.session_state.google_doc = docs["google"]
+        st.session_state.numpy_doc  = docs["numpy"]
+        st.session_state.rest_doc   = docs["rest"]
 
     google_doc = st.session_state.get("google_doc", "No docstring generated")
     numpy_doc  = st.session_state.get("numpy_doc", "No docstring generated")
@@ -363,9 +381,18 @@ elif page == "✅ Validation":
     else:
         st.subheader("📂 Files")
 
+        # One rule-engine run per file; re-run only when the file changes
+        docstring_checks = st.session_state.setdefault("docstring_checks", {})
         for f in parsed_files:
             file_path = f["file_path"]
-            violations = validate_docstrings(file_path)
+            try:
+                stamp = os.stat(file_path).st_mtime_ns
+            except OSError:
+                stamp = None
+            cached = docstring_checks.get(file_path)
+            if cached is None or cached[0] != stamp:
+                docstring_checks[file_path] = (stamp, validate_docstrings(file_path))
+            violations = docstring_checks[file_path][1]
 
             pep_status = "🟢 OK" if not violations else "🔴 Fix"
 
@@ -379,7 +406,10 @@ elif page == "✅ Validation":
 
         selected_file = st.session_state.get("validation_file")
         if selected_file:
-            violations = validate_docstrings(selected_file)
+            if selected_file in docstring_checks:
+                violations = docstring_checks[selected_file][1]
+            else:
+                violations = validate_docstrings(selected_file)
             
             st.subheader("📊Compliance Overview")
             c1, c2 = st.columns(2)
@@ -421,8 +451,14 @@ elif page == "📐 Metrics":
     if not current_code or current_code.strip() == "":
         st.info("The selected file is empty. Please upload code with functions (def).")
     else:
+        # One parse for every metric; reruns on unchanged code reuse it
+        if st.session_state.get("metrics_source") != current_code:
+            st.session_state.metrics = analyze_metrics(current_code)
+            st.session_state.metrics_source = current_code
+        metrics = st.session_state.metrics
+
         # ---------------- MAINTAINABILITY ----------------
-        mi_data = compute_maintainability_single(current_code)
+        mi_data = metrics.get("maintainability", {"score": 0, "status": "Error"})
 
         col1, col2, col3 = st.columns(3)
 
@@ -437,7 +473,7 @@ elif page == "📐 Metrics":
             )
 
         # ---------------- COMPLEXITY ----------------
-        complexity = summarize_complexity(current_code)
+        complexity = metrics.get("complexity") or {"error": metrics["error"]}
 
         if "per_function" in complexity:
             with col2:
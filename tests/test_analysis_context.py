@@ -0,0 +1,48 @@
+"""
+Tests for the shared per-file analysis context
+"""
+
+import pytest
+
+from core.analysis.context import AnalysisContext
+from core.parser.python_parser import parse_tree
+from core.validator.validator import validate_docstrings, validate_file
+
+CODE = '''
+def add(a, b):
+    """Add two numbers."""
+    return a + b
+
+def sub(a, b):
+    return a - b
+'''
+
+
+def test_derived_views_are_built_once():
+    context = AnalysisContext(CODE, "mod.py")
+
+    assert context.tree is context.tree
+    assert context.tokens is context.tokens
+    assert context.lines[1] == "def add(a, b):\n"
+    assert context.parse_error is None
+    assert [f["name"] for f in parse_tree(context.tree)] == ["add", "sub"]
+
+
+def test_parse_error_is_kept():
+    context = AnalysisContext("def bad(:\n")
+
+    assert isinstance(context.parse_error, SyntaxError)
+    with pytest.raises(SyntaxError):
+        context.tree
+
+
+def test_validators_use_context_without_reading_the_file():
+    context = AnalysisContext(CODE, "not/on/disk.py")
+
+    result = validate_file("not/on/disk.py", context=context)
+    violations = validate_docstrings("not/on/disk.py", context=context)
+
+    assert result["total_functions"] == 2
+    assert result["missing_docstrings"] == 1
+    assert result["pep257_violations"] >= 1
+    assert [v["line"] for v in violations] == [6]
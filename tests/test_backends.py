@@ -0,0 +1,123 @@
+"""
+Tests for the pluggable docstring backends
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.docstring_engine import backends, groq_integration
+from core.docstring_engine.backends import GroqBackend, LLMBackend, LlamaCppBackend
+from core.docstring_engine.groq_integration import generate_docstrings, get_backend
+
+CONTENT = {"summary": "Runs locally.", "arg_descs": {}, "ret_desc": ""}
+FN_INFO = {"name": "work", "args": [{"name": "x", "annotation": "int"}], "returns": "int"}
+
+
+class FakeLlama:
+    """Stands in for llama_cpp.Llama; records loads and overlapping calls."""
+
+    loads = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, model_path, **params):
+        FakeLlama.loads.append((model_path, params))
+
+    def create_chat_completion(self, messages, **options):
+        with FakeLlama.lock:
+            FakeLlama.active += 1
+            FakeLlama.peak = max(FakeLlama.peak, FakeLlama.active)
+        time.sleep(0.01)
+        with FakeLlama.lock:
+            FakeLlama.active -= 1
+        return {"choices": [{"message": {"content": json.dumps(CONTENT)}}]}
+
+
+@pytest.fixture
+def fake_llama(monkeypatch):
+    FakeLlama.loads, FakeLlama.active, FakeLlama.peak = [], 0, 0
+    monkeypatch.setattr(backends, "Llama", FakeLlama)
+    monkeypatch.setattr(backends, "_pools", {})
+    monkeypatch.setattr(groq_integration, "_local_backend", None)
+    return FakeLlama
+
+
+def test_local_model_is_loaded_once_and_shared(fake_llama, tmp_path):
+    path = str(tmp_path / "model.gguf")
+
+    first = LlamaCppBackend(path, n_threads=2)
+    second = LlamaCppBackend(path, n_threads=2)
+    docs = generate_docstrings(FN_INFO, backend=first)
+    generate_docstrings(FN_INFO, backend=second)
+
+    assert "Runs locally." in docs["google"]
+    assert first.pool is second.pool
+    assert len(fake_llama.loads) == 1
+    assert fake_llama.loads[0][1]["n_threads"] == 2
+
+
+def test_local_requests_are_bounded(fake_llama, tmp_path):
+    backend = LlamaCppBackend(str(tmp_path / "model.gguf"), max_concurrency=2)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: backend.complete_json("prompt"), range(16)))
+
+    assert fake_llama.peak <= 2
+    assert len(fake_llama.loads) == 2
+
+
+def test_backend_from_environment(fake_llama, monkeypatch, tmp_path):
+    monkeypatch.setenv("DOCSTRING_BACKEND", "llama_cpp")
+    monkeypatch.setenv("LLAMA_MODEL_PATH", str(tmp_path / "model.gguf"))
+    monkeypatch.setenv("LLAMA_N_THREADS", "3")
+
+    backend = get_backend()
+
+    assert isinstance(backend, LlamaCppBackend)
+    assert backend is get_backend()
+    assert backend.model == str(tmp_path / "model.gguf")
+    backend.pool.warm()
+    assert fake_llama.loads[0][1]["n_threads"] == 3
+
+
+def test_groq_is_the_default_backend(monkeypatch):
+    monkeypatch.delenv("DOCSTRING_BACKEND", raising=False)
+    monkeypatch.setattr(groq_integration, "client", object())
+
+    backend = get_backend()
+
+    assert isinstance(backend, GroqBackend)
+    assert backend.client is groq_integration.client
+
+
+def test_local_backend_needs_llama_cpp(monkeypatch, tmp_path):
+    monkeypatch.setattr(backends, "Llama", None)
+    monkeypatch.setattr(backends, "_pools", {})
+
+    with pytest.raises(ImportError):
+        LlamaCppBackend(str(tmp_path / "model.gguf"))
+
+
+def test_model_files_with_the_same_name_do_not_share_cache_keys(fake_llama, tmp_path):
+    for folder, size in (("a", 10), ("b", 20)):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "model.gguf").write_bytes(b"\0" * size)
+
+    first = LlamaCppBackend(str(tmp_path / "a" / "model.gguf"))
+    second = LlamaCppBackend(str(tmp_path / "b" / "model.gguf"))
+
+    assert first.model != second.model
+    assert first.model.startswith(str(tmp_path / "a" / "model.gguf"))
+
+
+def test_backends_must_implement_complete_json():
+    class Incomplete(LLMBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
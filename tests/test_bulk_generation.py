@@ -0,0 +1,331 @@
+"""
+Tests for bulk docstring generation against a local stub of the Groq API
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from groq import Groq
+
+from core.docstring_engine import bulk, groq_integration
+from core.docstring_engine.backends import LLMBackend
+from core.docstring_engine.bulk import AdaptiveConcurrency, BulkGenerator, RateLimiter, pack_batches
+from core.docstring_engine.llm_cache import LLMCache
+from core.parser.python_parser import parse_path
+
+CONTENT = {"summary": "Does the thing.", "arg_descs": {}, "ret_desc": "The result"}
+BATCH_ID = re.compile(r"\[(f\d+)\]\nName: (\w+)")
+NAME = re.compile(r"Name: (\w+)")
+MALFORMED = dict(CONTENT, arg_descs=["x"])
+
+
+class StubAPI(ThreadingHTTPServer):
+    """Chat completions endpoint with latency and a concurrency cap enforced by 429s."""
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.02, max_in_flight=None, omit=(), broken_batches=False, malformed=()):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.max_in_flight = max_in_flight
+        # Batch answers leave out these function names, or are not JSON at all
+        self.omit = set(omit)
+        self.broken_batches = broken_batches
+        # Single answers for these function names have arg_descs as a list
+        self.malformed = set(malformed)
+        self.batch_sizes = []
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = request["messages"][0]["content"]
+        ids = BATCH_ID.findall(prompt)
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+            limited = server.max_in_flight is not None and server.in_flight > server.max_in_flight
+            if limited:
+                server.throttled += 1
+        try:
+            if limited:
+                self._send(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                           [("retry-after", "0.05")])
+                return
+            time.sleep(server.latency)
+            if ids:
+                with server.lock:
+                    server.batch_sizes.append(len(ids))
+                answer = {i: CONTENT for i, name in ids if name not in server.omit}
+                content = "not json" if server.broken_batches else json.dumps(answer)
+            else:
+                content = json.dumps(MALFORMED if NAME.search(prompt).group(1) in server.malformed else CONTENT)
+            self._send(200, {
+                "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+            })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**options):
+        server = StubAPI(**options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, Groq(api_key="test", base_url=server.url, max_retries=0)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _functions(n):
+    functions = [{"name": f"fn{i}", "args": [{"name": "x", "annotation": "int"}], "docstring": None}
+                 for i in range(n)]
+    functions.append({"name": "documented", "args": [], "docstring": "Already done."})
+    return functions
+
+
+def test_bulk_generates_every_undocumented_function(stub):
+    server, client = stub(latency=0.1)
+    generator = BulkGenerator(client, rpm=None, tpm=None, max_concurrency=8, initial_concurrency=8)
+
+    start = time.perf_counter()
+    results = generator.run(_functions(16))
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == [f"fn{i}" for i in range(16)]
+    assert all("Does the thing." in r["docstrings"]["google"] for r in results.values())
+    assert server.requests == 16
+    assert server.peak > 1
+    # Serially this would take 16 * 0.1 s
+    assert elapsed < 1.0
+
+
+def test_bulk_backs_off_on_429(stub):
+    server, client = stub(latency=0.03, max_in_flight=2)
+    generator = BulkGenerator(client, rpm=None, tpm=None, max_concurrency=8, initial_concurrency=8,
+                              max_attempts=20)
+
+    results = generator.run(_functions(24))
+
+    assert all("docstrings" in r for r in results.values())
+    assert server.throttled > 0
+    assert generator.stats["throttled"] == server.throttled
+    assert generator.concurrency.limit < 8
+
+
+def test_bulk_reports_failures(stub):
+    server, client = stub(max_in_flight=0)
+    generator = BulkGenerator(client, rpm=None, tpm=None, max_attempts=2)
+
+    results = generator.run(_functions(2))
+
+    assert all("error" in r for r in results.values())
+    assert generator.stats["errors"] == 2
+    assert server.requests == 4
+
+
+def test_bulk_uses_cache(stub, tmp_path):
+    server, client = stub()
+    with LLMCache(str(tmp_path / "llm.db")) as cache:
+        BulkGenerator(client, rpm=None, tpm=None, cache=cache).run(_functions(3))
+        generator = BulkGenerator(client, rpm=None, tpm=None, cache=cache)
+        results = generator.run(_functions(3))
+
+    assert server.requests == 3
+    assert all(r["cached"] for r in results.values())
+
+
+def test_parsed_signature_shares_cache_with_single_requests(stub, tmp_path):
+    server, client = stub()
+    functions = parse_path(file_content="def area(w: int, h: int = 1) -> int:\n    return w * h\n")
+    with LLMCache(str(tmp_path / "llm.db")) as cache:
+        fn_info = {"name": "area", "args": [{"name": "w", "annotation": "int"}, {"name": "h", "annotation": "int"}],
+                   "returns": "int"}
+        cache.store(fn_info, groq_integration.MODEL, groq_integration.PROMPT_VERSION, CONTENT)
+        results = BulkGenerator(client, rpm=None, tpm=None, cache=cache).run(functions)
+
+    assert server.requests == 0
+    assert results["area"]["cached"]
+    assert "Returns:" in results["area"]["docstrings"]["google"]
+
+
+def test_malformed_answer_fails_only_its_function(stub, tmp_path):
+    server, client = stub(malformed={"fn1"})
+    with LLMCache(str(tmp_path / "llm.db")) as cache:
+        generator = BulkGenerator(client, rpm=None, tpm=None, cache=cache)
+
+        results = generator.run(_functions(3))
+
+        assert "error" in results["fn1"]
+        assert all("docstrings" in results[key] for key in ("fn0", "fn2"))
+        assert generator.stats["errors"] == 1
+        assert cache.stats()["entries"] == 2
+
+
+def test_render_failure_is_recorded_and_not_cached(stub, tmp_path, monkeypatch):
+    server, client = stub()
+    original = groq_integration.render_docstring
+
+    def render(fn_info, content, style):
+        if fn_info["name"] == "fn0":
+            raise AttributeError("cannot render")
+        return original(fn_info, content, style)
+
+    monkeypatch.setattr(groq_integration, "render_docstring", render)
+    with LLMCache(str(tmp_path / "llm.db")) as cache:
+        results = BulkGenerator(client, rpm=None, tpm=None, cache=cache).run(_functions(2))
+
+        assert results["fn0"]["error"] == "cannot render"
+        assert "docstrings" in results["fn1"]
+        assert cache.stats()["entries"] == 1
+
+
+def test_batches_pack_several_functions_per_request(stub):
+    server, client = stub()
+    generator = BulkGenerator(client, rpm=None, tpm=None, batch_tokens=100_000, batch_size=5)
+
+    results = generator.run(_functions(12))
+
+    assert all("Does the thing." in r["docstrings"]["numpy"] for r in results.values())
+    assert sorted(server.batch_sizes) == [2, 5, 5]
+    assert server.requests == 3
+    assert generator.stats["fallbacks"] == 0
+
+
+def test_partial_batch_falls_back_for_missing_ids(stub):
+    server, client = stub(omit={"fn3"})
+    generator = BulkGenerator(client, rpm=None, tpm=None, batch_tokens=100_000, batch_size=10)
+
+    results = generator.run(_functions(6))
+
+    assert all("docstrings" in r for r in results.values())
+    assert server.batch_sizes == [6]
+    assert server.requests == 2
+    assert generator.stats["fallbacks"] == 1
+
+
+def test_broken_batch_falls_back_for_every_function(stub):
+    server, client = stub(broken_batches=True)
+    generator = BulkGenerator(client, rpm=None, tpm=None, batch_tokens=100_000)
+
+    results = generator.run(_functions(4))
+
+    assert all("docstrings" in r for r in results.values())
+    assert server.requests == 5
+    assert generator.stats["fallbacks"] == 4
+
+
+def test_pack_batches_respects_token_budget():
+    items = [(f"fn{i}", {"name": f"fn{i}", "args": [], "returns": None}) for i in range(10)]
+
+    # Room for the preamble plus two answers of COMPLETION_TOKENS each
+    batches = pack_batches(items, max_tokens=1000)
+
+    assert [len(b) for b in batches] == [2, 2, 2, 2, 2]
+    assert [key for b in batches for key, _ in b] == [key for key, _ in items]
+    assert [len(b) for b in pack_batches(items, max_tokens=10)] == [1] * 10
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_rate_limiter_budgets():
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=2, tpm=1000, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire(100)
+    limiter.acquire(100)
+    assert clock.now == 0
+    limiter.acquire(100)  # third request waits for the first two to leave the window
+    assert clock.now == 60
+
+    limiter.acquire(950)  # over the token budget until the third leaves too
+    assert clock.now == 120
+
+
+def test_adaptive_concurrency_halves_once_per_burst():
+    limit = AdaptiveConcurrency(initial=8, maximum=8)
+    epochs = [limit.acquire() for _ in range(4)]
+
+    for epoch in epochs:
+        limit.throttled(epoch)
+
+    assert limit.limit == 4
+    limit.succeeded()
+    assert limit.limit == 4.25
+
+
+class TimedBackend(LLMBackend):
+    """Answers after `latency` seconds and records when each request was sent."""
+
+    model = "timed"
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def complete_json(self, prompt):
+        with self.lock:
+            self.sent.append(time.monotonic())
+        time.sleep(self.latency)
+        return json.dumps(CONTENT)
+
+
+def test_requests_waiting_for_a_slot_are_not_counted_before_they_are_sent(monkeypatch):
+    monkeypatch.setattr(bulk, "_WINDOW", 0.4)
+    backend = TimedBackend(latency=0.15)
+    generator = BulkGenerator(backend=backend, rpm=2, tpm=None, max_concurrency=4, initial_concurrency=1)
+
+    results = generator.run(_functions(6))
+
+    assert all("docstrings" in r for r in results.values())
+    sent = sorted(backend.sent)
+    # No more than rpm requests were sent in any window
+    assert all(later - earlier >= 0.4 - 0.01 for earlier, later in zip(sent, sent[2:]))
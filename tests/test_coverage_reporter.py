@@ -6,7 +6,7 @@ import json
 import os
 import tempfile
 
-from core.reporter.coverage_reporter import compute_coverage, write_report
+from core.reporter.coverage_reporter import CoverageAggregator, compute_coverage, write_report
 
 
 def test_compute_coverage_single_file():
@@ -82,3 +82,69 @@ def test_write_report_creates_file():
             data = json.load(f)
 
         assert data["overall"]["coverage_percent"] == 100.0
+
+
+def test_compute_coverage_consumes_generators():
+    def functions():
+        yield {"name": "a", "docstring": "doc"}
+        yield {"name": "b", "docstring": None}
+
+    results = ({"file_path": name, "functions": functions()} for name in ["x.py", "y.py"])
+    report = compute_coverage(results)
+
+    assert report["x.py"]["total_functions"] == 2
+    assert report["overall"]["functions_with_docstring"] == 2
+
+
+def test_aggregator_matches_compute_coverage():
+    data = [
+        {"file_path": "a.py", "functions": [{"name": "f", "docstring": "doc"}]},
+        {"file_path": "b.py", "functions": [{"name": "g", "docstring": None}, {"name": "h", "docstring": "d"}]},
+    ]
+    aggregator = CoverageAggregator()
+    for result in data:
+        aggregator.add(result)
+
+    assert aggregator.report() == compute_coverage(data)
+
+
+def test_aggregator_replace_and_remove_update_totals():
+    aggregator = CoverageAggregator()
+    aggregator.set_file("a.py", [{"name": "f", "docstring": None}])
+    aggregator.set_file("b.py", [{"name": "g", "docstring": "doc"}])
+
+    entry = aggregator.set_file("a.py", [{"name": "f", "docstring": "doc"}, {"name": "k", "docstring": None}])
+    assert entry["coverage_percent"] == 50.0
+    assert aggregator.overall()["total_functions"] == 3
+    assert aggregator.overall()["functions_with_docstring"] == 2
+
+    assert aggregator.remove_file("b.py") is True
+    assert aggregator.remove_file("b.py") is False
+    assert aggregator.overall() == aggregator.file("a.py")
+    assert "b.py" not in aggregator
+
+
+def test_aggregator_applies_watch_deltas():
+    aggregator = CoverageAggregator()
+    aggregator.set_file("old.py", [{"name": "f", "docstring": None}])
+
+    aggregator.apply_delta({
+        "changed": {"new.py": {"functions": [{"name": "g", "docstring": "doc"}]}, "bad.py": {"functions": None}},
+        "removed": ["old.py"],
+    })
+
+    assert sorted(aggregator.report()) == ["bad.py", "new.py", "overall"]
+    assert aggregator.overall()["coverage_percent"] == 100.0
+
+
+def test_aggregator_state_round_trips(tmp_path):
+    aggregator = CoverageAggregator()
+    aggregator.set_file("a.py", [{"name": "f", "docstring": "doc"}, {"name": "g", "docstring": None}])
+    path = str(tmp_path / "state" / "coverage.json")
+
+    aggregator.save(path)
+    restored = CoverageAggregator.load(path)
+
+    assert restored.report() == aggregator.report()
+    restored.remove_file("a.py")
+    assert restored.overall()["total_functions"] == 0
@@ -7,7 +7,7 @@ import os
 import tempfile
 import pandas as pd
 
-from dashboard.dashboard import get_functions, dashboard
+from dashboard.dashboard import get_functions, dashboard, load_report_page
 
 
 def create_temp_py(code: str):
@@ -94,3 +94,15 @@ def test_dashboard_runs_without_crash(monkeypatch):
 
     # should not raise error
     dashboard()
+
+
+def test_load_report_page_reads_one_slice(tmp_path):
+    from core.reporter.report_writers import write_ndjson
+
+    path = str(tmp_path / "coverage.ndjson.gz")
+    write_ndjson(({"type": "file", "file_path": f"f{i}.py"} for i in range(7)), path)
+
+    page = load_report_page(path, page=1, page_size=3)
+
+    assert list(page["file_path"]) == ["f3.py", "f4.py", "f5.py"]
+    assert load_report_page(str(tmp_path / "missing.ndjson")).empty
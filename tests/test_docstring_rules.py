@@ -0,0 +1,136 @@
+"""
+Tests for the AST-based PEP-257 rule engine
+"""
+
+import pytest
+
+from core.analysis.context import AnalysisContext
+from core.validator.docstring_rules import RULES, check_context, check_source, rule, select_rules
+
+CODE = '''"""Module docstring."""
+
+
+@decorator
+def undocumented(
+    a,
+    b,
+):
+    return a
+
+
+class Box:
+    """A box."""
+
+    def __init__(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+    def open(self):
+
+        """returns the lid"""
+        return 1
+
+    def _private(self):
+        pass
+
+
+def nested():
+    """Outer."""
+    def inner():
+        pass
+    return inner
+'''
+
+
+def codes(violations):
+    return [(v["code"], v["line"]) for v in violations]
+
+
+def test_missing_docstrings_cover_multiline_signatures_and_methods():
+    violations = check_source(CODE, select=["D1"])
+
+    assert codes(violations) == [("D103", 5), ("D107", 15), ("D105", 18)]
+    assert violations[0]["definition"] == "undocumented"
+    assert violations[1]["definition"] == "Box.__init__"
+
+
+def test_docstring_content_rules():
+    found = codes(check_source(CODE, select=["D2", "D4"]))
+
+    assert ("D201", 23) in found
+    assert ("D400", 23) in found
+    assert ("D401", 23) in found
+    assert ("D403", 23) in found
+
+
+def test_select_and_ignore_prefixes():
+    assert [r.code for r in select_rules(["D10"], ignore=["D100", "D104"])] == [
+        "D101", "D102", "D103", "D105", "D106", "D107",
+    ]
+    assert all(v["code"] != "D401" for v in check_source(CODE, ignore=["D401"]))
+
+
+def test_module_and_private_names():
+    source = "def _helper():\n    pass\n"
+
+    assert codes(check_source(source)) == [("D100", 1)]
+    assert check_source(source, file_path="_private.py") == []
+    assert codes(check_source("", file_path="pkg/__init__.py")) == [("D104", 1)]
+
+
+def test_dunder_all_limits_public_names():
+    source = '"""Doc."""\n__all__ = ["kept"]\n\ndef kept():\n    pass\n\ndef hidden():\n    pass\n'
+
+    assert codes(check_source(source)) == [("D103", 4)]
+
+
+def test_empty_docstring_is_terminal():
+    violations = check_source('def f():\n    """ """\n', select=["D2", "D4"])
+
+    assert codes(violations) == [("D419", 2)]
+
+
+def test_registered_rule_runs_in_same_pass():
+    @rule("D999", "Docstring mentions TODO")
+    def _todo(definition, lines):
+        if "TODO" in definition.docstring.value:
+            return ()
+
+    try:
+        violations = check_source('def f():\n    """TODO: document."""\n', select=["D999"])
+        assert codes(violations) == [("D999", 2)]
+    finally:
+        del RULES["D999"]
+
+
+def test_check_context_raises_on_syntax_error():
+    with pytest.raises(SyntaxError):
+        check_context(AnalysisContext("def broken(:\n"))
+
+
+def test_noqa_comments_skip_definitions():
+    source = (
+        '"""Doc."""\n\n'
+        "def quiet():  # noqa\n    pass\n\n"
+        "def picky():  # noqa: D103\n    pass\n\n"
+        "def partly():  # noqa: D400\n    '''returns things'''\n"
+    )
+
+    assert codes(check_source(source, select=["D103", "D400", "D401"])) == [("D401", 10)]
+
+
+def test_dunder_all_with_one_entry_matches_like_pydocstyle():
+    source = '"""Doc."""\n__all__ = ["IntervalUnit"]\n\nclass Interval:\n    pass\n\nclass Other:\n    pass\n'
+
+    assert codes(check_source(source)) == [("D101", 4)]
+
+
+def test_any_private_parent_folder_makes_module_private(tmp_path):
+    path = tmp_path / "_vendor" / "lib" / "mod.py"
+
+    assert codes(check_source("def f():\n    pass\n", file_path=str(path))) == [("D103", 1)]
+    assert codes(check_source("def f():\n    pass\n", file_path=str(tmp_path / "lib" / "mod.py"))) == [
+        ("D100", 1), ("D103", 1),
+    ]
@@ -0,0 +1,77 @@
+"""
+Parity tests for the fast docstring coverage scanner
+"""
+
+import pytest
+
+from core.parser.fast_coverage import _Ambiguous, coverage_functions, scan_functions
+from core.parser.python_parser import iter_python_files, parse_path
+
+TRICKY = '''
+"""def not_a_function(): pass"""
+# def commented(): pass
+
+def plain(a, b=":", c=(1, 2)) -> "x:y":
+    """Doc with def inside."""
+
+def one_liner(): "inline doc"
+
+def not_doc():
+    "text".strip()
+
+def fstring():
+    f"""formatted {1}"""
+
+def concatenated():
+    "first " \\
+    "second"
+
+def empty():
+    """   """
+
+async def skipped():
+    """Async functions are not in parse_path output."""
+
+class K:
+    def method(self):
+        # leading comment
+
+        r"""Raw docstring."""
+        def nested():
+            pass
+'''
+
+
+def _pairs(functions):
+    return sorted(((f["name"], f["docstring"]) for f in functions), key=lambda p: (p[0], p[1] or ""))
+
+
+def test_scan_matches_parse_path_on_tricky_code():
+    assert _pairs(scan_functions(TRICKY)) == _pairs(parse_path(file_content=TRICKY, profile="coverage"))
+
+
+@pytest.mark.parametrize("root", ["examples", "core", "tests"])
+def test_scan_matches_parse_path_on_corpus(root):
+    for path in iter_python_files(root):
+        with open(path) as f:
+            source = f.read()
+        try:
+            fast = scan_functions(source)
+        except _Ambiguous:
+            continue
+        assert _pairs(fast) == _pairs(parse_path(file_content=source, profile="coverage")), path
+
+
+def test_ambiguous_code_falls_back_to_parser():
+    code = "def f(x) -> lambda: 0:\n    '''doc'''\n"
+    with pytest.raises(_Ambiguous):
+        scan_functions(code)
+    assert coverage_functions(file_content=code) == parse_path(file_content=code, profile="coverage")
+
+
+def test_check_syntax_reports_errors_outside_definitions():
+    code = "def f():\n    '''doc'''\n\nx = (\n"
+
+    assert _pairs(coverage_functions(file_content=code)) == [("f", "doc")]
+    with pytest.raises(SyntaxError):
+        coverage_functions(file_content=code, check_syntax=True)
@@ -0,0 +1,82 @@
+"""
+Tests for the SQLite history store
+"""
+
+import sqlite3
+import time
+
+from core.history.history_store import HistoryStore, package_of
+from core.parser.python_parser import parse_path
+
+PARSED = [
+    {"file_path": "/repo/pkg/a.py", "functions": [
+        {"name": "f", "docstring": "doc", "complexity": 2},
+        {"name": "f", "docstring": None, "complexity": 1},
+    ]},
+    {"file_path": "/repo/pkg/sub/b.py", "functions": [{"name": "g", "docstring": None, "complexity": 1}]},
+    {"file_path": "/repo/top.py", "functions": [{"name": "h", "docstring": "doc", "complexity": 1}]},
+]
+VALIDATED = [
+    {"file": "/repo/pkg/a.py", "parse_error": False, "pep257_violations": 1, "formatting_issues": 1,
+     "formatting_violations": [{"code": "E225", "line": 3, "column": 2, "message": "missing whitespace"}]},
+]
+
+
+def test_package_of():
+    assert package_of("/repo/pkg/sub/b.py", "/repo") == "pkg.sub"
+    assert package_of("/repo/pkg/__init__.py", "/repo") == "pkg"
+    assert package_of("/repo/top.py", "/repo") == ""
+
+
+def test_record_run_stores_all_tables(tmp_path):
+    with HistoryStore(str(tmp_path / "history.db")) as store:
+        run_id = store.record_run(PARSED, VALIDATED, root="/repo", label="main")
+
+        run = store.runs()[0]
+        assert run["id"] == run_id and run["label"] == "main"
+        assert (run["total_functions"], run["functions_with_docstring"]) == (4, 2)
+
+        files = {f["file_path"]: f for f in store.run_files(run_id)}
+        assert files["/repo/pkg/a.py"]["formatting_issues"] == 1
+        assert files["/repo/pkg/sub/b.py"]["package"] == "pkg.sub"
+        assert sorted(f["key"] for f in store.run_functions(run_id)) == ["f", "f#2", "g", "h"]
+        assert store.run_violations(run_id)[0]["code"] == "E225"
+
+
+def test_coverage_by_package_over_window(tmp_path):
+    now = time.time()
+    with HistoryStore(str(tmp_path / "history.db")) as store:
+        store.record_run(PARSED, root="/repo", started_at=now - 200 * 86400)
+        recent = store.record_run(PARSED, root="/repo", started_at=now - 86400)
+
+        rows = store.coverage_by_package(days=90, now=now)
+
+    assert {r["run_id"] for r in rows} == {recent}
+    by_package = {r["package"]: r for r in rows}
+    assert by_package["pkg"]["coverage_percent"] == 50.0
+    assert by_package["pkg.sub"]["coverage_percent"] == 0
+    assert by_package[""]["coverage_percent"] == 100.0
+
+
+def test_delete_runs_cascades(tmp_path):
+    path = str(tmp_path / "history.db")
+    with HistoryStore(path) as store:
+        store.record_run(PARSED, VALIDATED, root="/repo", started_at=1.0)
+        assert store.delete_runs_before(2.0) == 1
+        assert store.runs() == []
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM functions").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM violations").fetchone()[0] == 0
+    conn.close()
+
+
+def test_functions_are_keyed_by_qualified_name(tmp_path):
+    code = "class A:\n    def __init__(self):\n        '''Doc.'''\n\nclass B:\n    def __init__(self):\n        pass\n"
+    parsed = [{"file_path": "/repo/m.py", "functions": parse_path(file_content=code)}]
+
+    with HistoryStore(str(tmp_path / "history.db")) as store:
+        run_id = store.record_run(parsed, root="/repo")
+        keys = {f["key"]: f["has_docstring"] for f in store.run_functions(run_id)}
+
+    assert keys == {"A.__init__": 1, "B.__init__": 0}
@@ -0,0 +1,63 @@
+"""
+Tests for incremental per-function reanalysis
+"""
+
+from core.parser.incremental import IncrementalAnalyzer
+from core.parser.python_parser import parse_path
+
+CODE = '''
+def first(a):
+    return a
+
+class Greeter:
+    def hello(self, name="x"):
+        if name:
+            def inner():
+                pass
+        return name
+
+def last():
+    pass
+'''
+
+
+def test_update_matches_parse_path():
+    analyzer = IncrementalAnalyzer()
+
+    assert analyzer.update(CODE) == parse_path(file_content=CODE)
+    assert analyzer.reanalyzed == 3
+    assert set(analyzer.spans) == {"first", "Greeter.hello", "last"}
+
+
+def test_edit_reanalyzes_only_changed_function():
+    analyzer = IncrementalAnalyzer()
+    analyzer.update(CODE)
+    edited = CODE.replace("    return a\n", '    """Return a."""\n    return a\n')
+
+    functions = analyzer.update(edited)
+
+    assert functions == parse_path(file_content=edited)
+    assert analyzer.reanalyzed == 1
+    assert analyzer.reused == 2
+    assert analyzer.spans["last"] == (13, 14)
+
+
+def test_unchanged_source_is_not_reparsed():
+    analyzer = IncrementalAnalyzer()
+    functions = analyzer.update(CODE)
+    tree = analyzer.tree
+
+    assert analyzer.update(CODE) is functions
+    assert analyzer.tree is tree
+
+
+def test_reused_method_gets_its_new_qualified_name():
+    analyzer = IncrementalAnalyzer()
+    analyzer.update(CODE)
+    renamed = CODE.replace("class Greeter:", "class Welcomer:")
+
+    functions = analyzer.update(renamed)
+
+    assert functions == parse_path(file_content=renamed)
+    assert analyzer.reused == 3
+    assert "Welcomer.hello.inner" in {fn["qualname"] for fn in functions}
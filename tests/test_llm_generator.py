@@ -1,7 +1,8 @@
 import json
 import pytest
 from unittest.mock import patch, MagicMock
-from core.docstring_engine.groq_integration import generate_placeholder_docstring
+from core.docstring_engine.groq_integration import generate_docstrings, generate_placeholder_docstring
+from core.docstring_engine.llm_cache import LLMCache
 # ---------------- Sample input ----------------
 FN_INFO = {
     "name": "add_numbers",
@@ -77,3 +78,61 @@ def test_llm_failure_returns_error(mock_client):
     result = generate_placeholder_docstring(FN_INFO, "google")
 
     assert result == "Error generating docstring."
+
+# ---------------- Test: all styles from one call ----------------
+@patch("core.docstring_engine.groq_integration.client")
+def test_all_styles_share_one_llm_call(mock_client):
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(message=MagicMock(content=json.dumps(LLM_JSON)))
+    ]
+    mock_client.chat.completions.create.return_value = mock_response
+
+    fn_info = {"name": "add_numbers", "args": [{"name": "a", "annotation": "int"}], "returns": "int"}
+
+    docs = generate_docstrings(fn_info, ("google", "numpy", "rest"))
+
+    assert set(docs) == {"google", "numpy", "rest"}
+    assert all("Adds two numbers." in doc for doc in docs.values())
+    mock_client.chat.completions.create.assert_called_once()
+
+# ---------------- Test: persistent response cache ----------------
+@patch("core.docstring_engine.groq_integration.client")
+def test_cached_signature_skips_llm(mock_client, tmp_path):
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(message=MagicMock(content=json.dumps(LLM_JSON)))
+    ]
+    mock_client.chat.completions.create.return_value = mock_response
+    fn_info = {"name": "add_numbers", "args": [{"name": "a", "annotation": "int"}], "returns": "int"}
+
+    with LLMCache(str(tmp_path / "llm.db")) as cache:
+        first = generate_docstrings(fn_info, cache=cache)
+        second = generate_docstrings(dict(fn_info), cache=cache)
+        assert mock_client.chat.completions.create.call_count == 1
+        assert first == second
+        assert cache.stats()["hits"] == 1
+
+        generate_docstrings(fn_info, cache=cache, bypass_cache=True)
+        assert mock_client.chat.completions.create.call_count == 2
+
+        other = dict(fn_info, returns="float")
+        generate_docstrings(other, cache=cache)
+        assert mock_client.chat.completions.create.call_count == 3
+
+
+# ---------------- Test: malformed answers are not cached ----------------
+@patch("core.docstring_engine.groq_integration.client")
+def test_malformed_answer_is_not_cached(mock_client, tmp_path):
+    bad = MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps(dict(LLM_JSON, arg_descs=["a"]))))])
+    good = MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps(LLM_JSON)))])
+    mock_client.chat.completions.create.side_effect = [bad, good]
+    fn_info = {"name": "add_numbers", "args": [{"name": "a", "annotation": "int"}], "returns": "int"}
+
+    with LLMCache(str(tmp_path / "llm.db")) as cache:
+        first = generate_docstrings(fn_info, cache=cache)
+        second = generate_docstrings(fn_info, cache=cache)
+
+    assert all(doc.startswith("Error:") for doc in first.values())
+    assert "Adds two numbers." in second["google"]
+    assert mock_client.chat.completions.create.call_count == 2
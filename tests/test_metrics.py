@@ -0,0 +1,75 @@
+"""
+Tests for the single-parse metrics engine
+"""
+
+from radon.complexity import cc_visit
+from radon.metrics import mi_visit
+
+from core.analysis.context import AnalysisContext
+from core.metrics.engine import analyze_metrics
+from core.validator.validator import (
+    compute_complexity_from_string,
+    compute_maintainability_single,
+    summarize_complexity,
+)
+
+CODE = '''
+"""Module docstring."""
+
+def add(a, b):
+    # sum
+    if a > b:
+        return a + b
+    return b + a
+
+class Box:
+    def size(self, items):
+        def inner():
+            return 1
+        return len(items) if items else inner()
+'''
+
+
+def test_analyze_metrics_sections():
+    metrics = analyze_metrics(CODE)
+
+    names = [fn["fullname"] for fn in metrics["functions"]]
+    assert names == ["add", "Box.size", "inner"]
+    assert metrics["functions"][0]["complexity"] == 2
+    assert metrics["raw"]["comments"] == 1
+    assert metrics["halstead"]["total"]["volume"] > 0
+    assert "add" in metrics["halstead"]["functions"]
+
+
+def test_analyze_metrics_matches_radon():
+    metrics = analyze_metrics(CODE)
+
+    assert metrics["maintainability"]["score"] == round(mi_visit(CODE, multi=True), 2)
+    expected = {item.name: item.complexity for item in cc_visit(CODE)}
+    assert metrics["complexity"]["per_function"] == expected
+
+
+def test_analyze_metrics_uses_context_tree():
+    context = AnalysisContext(CODE)
+    tree = context.tree
+
+    analyze_metrics(context=context)
+
+    assert context.tree is tree
+
+
+def test_analyze_metrics_syntax_error():
+    assert "error" in analyze_metrics("def broken(:\n")
+
+
+def test_legacy_metric_shapes():
+    assert compute_complexity_from_string(CODE)["add"] == 2
+    assert compute_complexity_from_string("x = 1\n") == {"info": "No functions found"}
+
+    summary = summarize_complexity(CODE)
+    assert summary["risk_level"] == "Low"
+    assert summary["max_complexity"] == max(summary["per_function"].values())
+
+    mi = compute_maintainability_single(CODE)
+    assert set(mi) == {"score", "status"}
+    assert compute_maintainability_single("def broken(:\n") == {"score": 0, "status": "Error"}
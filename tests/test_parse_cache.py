@@ -0,0 +1,99 @@
+"""
+Tests for the persistent parse cache
+"""
+
+from core.cache.sqlite_cache import SQLiteCache
+from core.parser.parse_cache import ParseCache
+from core.parser.python_parser import parse_directory, parse_path
+
+
+def test_parse_path_uses_cache(tmp_path):
+    code = "def a():\n    '''doc'''\n"
+    with ParseCache(str(tmp_path / "cache.db")) as cache:
+        first = parse_path(file_content=code, cache=cache)
+        second = parse_path(file_content=code, cache=cache)
+
+        assert first == second == parse_path(file_content=code)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+
+def test_cache_persists_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    code = "def a(x: int = 1): pass\n"
+    with ParseCache(path) as cache:
+        parse_path(file_content=code, cache=cache)
+
+    with ParseCache(path) as cache:
+        assert cache.lookup(code) == parse_path(file_content=code)
+        assert cache.lookup(code + "\n") is None
+
+
+def test_parse_directory_only_parses_changed_files(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.py").write_text("def a(): pass\n")
+    (src / "b.py").write_text("def b(): pass\n")
+
+    with ParseCache(str(tmp_path / "cache.db")) as cache:
+        cold = parse_directory(str(src), workers=1, cache=cache)
+        (src / "b.py").write_text("def b():\n    '''doc'''\n")
+        warm = parse_directory(str(src), workers=1, cache=cache)
+
+        assert cache.stats()["hits"] == 1
+        assert cold[0] == warm[0]
+        assert warm[1]["functions"][0]["docstring"] == "doc"
+
+
+def test_lru_eviction(tmp_path):
+    with SQLiteCache(str(tmp_path / "kv.db"), max_entries=2) as cache:
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.trim() == 1
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["entries"] == 2
+
+
+def test_streamed_directory_with_pool_uses_cache(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(5):
+        (src / f"m{i}.py").write_text(f"def f{i}(): pass\n")
+
+    with ParseCache(str(tmp_path / "cache.db")) as cache:
+        cold = parse_directory(str(src), workers=2, chunksize=2, cache=cache)
+        (src / "m2.py").write_text("def changed(): pass\n")
+        warm = parse_directory(str(src), workers=2, chunksize=2, cache=cache)
+
+        assert cache.stats()["hits"] == 4
+        assert [r["functions"][0]["name"] for r in warm] == ["f0", "f1", "changed", "f3", "f4"]
+        assert cold[0] == warm[0]
+
+
+def test_profiles_are_cached_separately(tmp_path):
+    code = "def a(x: int): pass\n"
+    with ParseCache(str(tmp_path / "cache.db")) as cache:
+        full = parse_path(file_content=code, cache=cache)
+        lean = parse_path(file_content=code, cache=cache, profile="coverage")
+
+        assert full[0]["args"][0]["annotation"] == "int"
+        assert lean[0]["args"] == [{"name": "x"}]
+        assert cache.stats()["misses"] == 2
+
+
+def test_ttl_expiry(tmp_path):
+    with SQLiteCache(str(tmp_path / "ttl.db"), ttl=60) as cache:
+        cache.put("old", 1)
+        cache.put("new", 2)
+        cache._conn.execute("UPDATE entries SET created = created - 120 WHERE key = 'old'")
+
+        assert cache.get("old") is None
+        assert cache.get("new") == 2
+        assert cache.trim() == 1
+        assert cache.stats()["entries"] == 1
+
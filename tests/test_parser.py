@@ -8,7 +8,11 @@ import pytest
 from core.parser.python_parser import (
     _get_annotation,
     _get_default_str,
+    _parse_function,
     is_long_function,
+    iter_functions,
+    iter_path,
+    parse_directory,
     parse_path,
 )
 
@@ -38,6 +42,7 @@ def add(a: int, b: int) -> int:
     fn = results[0]
 
     assert fn["name"] == "add"
+    assert fn["returns"] == "int"
     assert fn["complexity"] >= 1
     assert fn["docstring"] is None
     assert fn["missing_type_hints"] == []
@@ -89,3 +94,145 @@ def test_parse_path_file_content():
 def test_parse_path_invalid_usage():
     with pytest.raises(ValueError):
         parse_path()
+
+
+def test_nested_functions_match_walk_order_and_nesting():
+    code = """
+def outer(x):
+    if x:
+        def inner(y):
+            for i in y:
+                while i:
+                    pass
+        return inner
+    def sibling():
+        pass
+"""
+    results = parse_path(file_content=code)
+    expected = [
+        node.name for node in ast.walk(ast.parse(code))
+        if isinstance(node, ast.FunctionDef)
+    ]
+
+    assert [fn["name"] for fn in results] == expected
+    by_name = {fn["name"]: fn for fn in results}
+    assert by_name["outer"]["max_nesting"] == 3
+    assert by_name["inner"]["max_nesting"] == 2
+    assert by_name["sibling"]["max_nesting"] == 0
+
+
+def test_parse_function_matches_single_pass():
+    code = """
+def f(a, b=2):
+    with open(a) as fh:
+        try:
+            return fh.read()
+        except OSError:
+            return b
+"""
+    node = ast.parse(code).body[0]
+    assert parse_path(file_content=code) == [_parse_function(node)]
+
+
+def test_parse_directory_recurses_in_path_order(tmp_path):
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "b.py").write_text("def b():\n    '''doc'''\n")
+    (tmp_path / "pkg" / "a.py").write_text("def a(): pass\n")
+    (tmp_path / "pkg" / "sub" / "c.py").write_text("def c(: pass\n")
+    (tmp_path / "__pycache__" / "skip.py").write_text("def skip(): pass\n")
+
+    results = parse_directory(str(tmp_path), workers=2, chunksize=1)
+
+    assert [r["file_path"] for r in results] == [
+        str(tmp_path / "b.py"),
+        str(tmp_path / "pkg" / "a.py"),
+        str(tmp_path / "pkg" / "sub" / "c.py"),
+    ]
+    assert results[0]["functions"][0]["docstring"] == "doc"
+    assert results[1]["functions"][0]["name"] == "a"
+    assert results[2]["functions"] == [] and "error" in results[2]
+    assert parse_directory(str(tmp_path), workers=1) == results
+
+
+def test_parse_directory_rejects_files(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("def a(): pass\n")
+    with pytest.raises(ValueError):
+        parse_directory(str(path))
+
+
+def test_iter_functions_streams_all_records():
+    code = """
+def outer():
+    def inner():
+        pass
+def last():
+    '''doc'''
+"""
+    streamed = list(iter_functions(file_content=code))
+
+    assert [fn["name"] for fn in streamed] == ["inner", "outer", "last"]
+    assert sorted(streamed, key=lambda fn: fn["name"]) == sorted(
+        parse_path(file_content=code), key=lambda fn: fn["name"]
+    )
+
+
+def test_iter_path_streams_directory_in_path_order(tmp_path):
+    for i in range(7):
+        (tmp_path / f"m{i}.py").write_text(f"def f{i}(): pass\n")
+
+    results = iter_path(str(tmp_path), workers=2, chunksize=2)
+
+    assert not isinstance(results, list)
+    assert [r["functions"][0]["name"] for r in results] == [f"f{i}" for i in range(7)]
+    single = list(iter_path(str(tmp_path / "m3.py"), compact=True))
+    assert single[0]["functions"][0].name == "f3"
+
+
+def test_fast_unparse_matches_ast_unparse():
+    code = "def f(a: int = -1, b: typing.List[int] = None, c: np.ndarray = True, d='x', e=10): pass"
+    args = ast.parse(code).body[0].args
+    for node in [a.annotation for a in args.args if a.annotation] + args.defaults:
+        assert _get_annotation(node) == ast.unparse(node)
+
+
+def test_coverage_profile_records_only_coverage_fields():
+    code = '''
+class K:
+    def add(self, a: int, b: int = 2) -> int:
+        """Add."""
+        if a:
+            def inner():
+                pass
+        return [lambda: 0 for _ in range(b)]
+'''
+    full = parse_path(file_content=code)
+    lean = parse_path(file_content=code, profile="coverage")
+
+    assert lean[0] == {"name": "add", "qualname": "K.add", "args": [{"name": "self"}, {"name": "a"}, {"name": "b"}],
+                       "docstring": "Add."}
+    assert [(f["qualname"], f["docstring"]) for f in lean] == [(f["qualname"], f["docstring"]) for f in full]
+    with pytest.raises(ValueError):
+        parse_path(file_content=code, profile="fast")
+    with pytest.raises(ValueError):
+        parse_path(file_content=code, profile="coverage", compact=True)
+
+
+def test_records_carry_qualified_names():
+    code = """
+class A:
+    def __init__(self):
+        def helper():
+            pass
+
+class B:
+    def __init__(self):
+        pass
+
+def top():
+    pass
+"""
+    results = parse_path(file_content=code)
+
+    assert sorted(fn["qualname"] for fn in results) == ["A.__init__", "A.__init__.helper", "B.__init__", "top"]
@@ -0,0 +1,66 @@
+"""
+Tests for compact and columnar function records
+"""
+
+import pytest
+
+from core.parser.python_parser import parse_path
+from core.parser.records import FunctionRecord, FunctionTable, to_dicts
+from core.reporter.coverage_reporter import compute_coverage
+
+CODE = '''
+def add(a: int, b: int = 2) -> int:
+    """Add two numbers."""
+    return a + b
+
+def noop(x, *rest):
+    pass
+'''
+
+
+def test_compact_parse_round_trips_to_dicts():
+    records = parse_path(file_content=CODE, compact=True)
+
+    assert all(isinstance(r, FunctionRecord) for r in records)
+    assert to_dicts(records) == parse_path(file_content=CODE)
+
+
+def test_function_table_rows_and_adapter():
+    dicts = parse_path(file_content=CODE)
+    table = FunctionTable(dicts)
+
+    assert len(table) == 2
+    assert table[0].args[1].default == "2"
+    assert table[-1].missing_type_hints == ("x", "return")
+    assert table.documented_count() == 1
+    assert table.to_dicts() == dicts
+    with pytest.raises(IndexError):
+        table[2]
+
+
+def test_compute_coverage_accepts_compact_forms():
+    records = parse_path(file_content=CODE, compact=True)
+    report = compute_coverage([
+        {"file_path": "records.py", "functions": records},
+        {"file_path": "table.py", "functions": FunctionTable(records)},
+    ])
+
+    assert report["records.py"]["coverage_percent"] == 50.0
+    assert report["table.py"]["functions_with_docstring"] == 1
+    assert report["overall"]["total_functions"] == 4
+
+
+def test_function_keys_disambiguate_repeats():
+    from core.parser.records import function_keys
+
+    functions = [{"name": "f"}, {"name": "g"}, {"name": "f"}, {"name": "m", "qualname": "C.m"}]
+
+    assert function_keys(functions) == ["f", "g", "f#2", "C.m"]
+
+
+def test_function_keys_use_record_qualnames():
+    from core.parser.records import function_keys
+
+    code = "class A:\n    def m(self): pass\nclass B:\n    def m(self): pass\n"
+
+    assert function_keys(parse_path(file_content=code, compact=True)) == ["A.m", "B.m"]
@@ -0,0 +1,126 @@
+"""
+Tests for run-to-run report diffing
+"""
+
+import gzip
+import json
+import os
+
+from core.history.history_store import HistoryStore
+from core.parser.python_parser import parse_path
+from core.reporter.report_diff import (
+    diff_snapshots,
+    is_regression,
+    load_snapshot,
+    main,
+    snapshot_from_results,
+    snapshot_from_run,
+)
+from core.reporter.report_writers import write_json
+
+
+def _parsed(root, docs):
+    return [{"file_path": os.path.join(root, "pkg", "a.py"), "functions": [
+        {"name": name, "qualname": name, "docstring": doc} for name, doc in docs.items()
+    ]}]
+
+def _validated(root, violations):
+    return [{"file": os.path.join(root, "pkg", "a.py"), "formatting_violations": violations}]
+
+E225 = {"code": "E225", "line": 3, "column": 5, "message": "missing whitespace around operator"}
+E501 = {"code": "E501", "line": 9, "column": 80, "message": "line too long"}
+
+OLD = ("/old", {"f": "doc", "g": None, "gone": None}, [E225])
+NEW = ("/new", {"f": None, "g": "doc", "Cls.added": None}, [dict(E225, line=7), E501])
+
+
+def _snapshot(root, docs, violations):
+    return snapshot_from_results(_parsed(root, docs), _validated(root, violations), root=root)
+
+
+def test_diff_lists_lost_docstrings_and_new_violations():
+    diff = diff_snapshots(_snapshot(*OLD), _snapshot(*NEW))
+
+    assert diff["lost_docstrings"] == [{"file": "pkg/a.py", "function": "f"}]
+    assert diff["gained_docstrings"] == [{"file": "pkg/a.py", "function": "g"}]
+    assert diff["added_functions"] == [{"file": "pkg/a.py", "function": "Cls.added"}]
+    assert diff["removed_functions"] == [{"file": "pkg/a.py", "function": "gone"}]
+    # E225 only moved, so it is not new
+    assert [v["code"] for v in diff["new_violations"]] == ["E501"]
+    assert diff["fixed_violations"] == []
+    assert diff["coverage"] == {}
+    assert is_regression(diff)
+
+
+def test_identical_runs_have_no_regression():
+    diff = diff_snapshots(_snapshot(*OLD), _snapshot(*OLD))
+
+    assert not is_regression(diff)
+    assert diff["coverage"] == {}
+    assert diff["overall"]["delta"] == 0
+
+
+def test_coverage_deltas_per_file():
+    old = _snapshot("/r", {"f": None, "g": None}, [])
+    new = _snapshot("/r", {"f": "doc", "g": None}, [])
+
+    diff = diff_snapshots(old, new)
+
+    assert diff["coverage"] == {"pkg/a.py": {"before": 0.0, "after": 50.0, "delta": 50.0}}
+    assert diff["overall"] == {"before": 0.0, "after": 50.0, "delta": 50.0}
+
+
+def test_diff_two_stored_runs(tmp_path):
+    with HistoryStore(str(tmp_path / "history.db")) as store:
+        old_id = store.record_run(_parsed(*OLD[:2]), _validated(OLD[0], OLD[2]), root=OLD[0])
+        new_id = store.record_run(_parsed(*NEW[:2]), _validated(NEW[0], NEW[2]), root=NEW[0])
+
+        stored = diff_snapshots(snapshot_from_run(store, old_id), snapshot_from_run(store, new_id))
+
+    assert stored == diff_snapshots(_snapshot(*OLD), _snapshot(*NEW))
+
+
+def test_cli_exit_code_gates_regressions(tmp_path, capsys):
+    old_path, new_path = str(tmp_path / "old.json"), str(tmp_path / "new.json")
+    for path, (root, docs, violations) in ((old_path, OLD), (new_path, NEW)):
+        with open(path, "w") as f:
+            json.dump({"parse_results": _parsed(root, docs), "validation_results": _validated(root, violations)}, f)
+
+    assert main([old_path, new_path, "--old-root", "/old", "--new-root", "/new"]) == 0
+    assert "pkg/a.py::f" in capsys.readouterr().out
+    assert main([old_path, new_path, "--old-root", "/old", "--new-root", "/new", "--fail-on-regression"]) == 1
+    assert main([old_path, old_path, "--old-root", "/old", "--new-root", "/old", "--fail-on-regression"]) == 0
+
+
+def test_load_coverage_report(tmp_path):
+    path = str(tmp_path / "coverage.json")
+    with open(path, "w") as f:
+        json.dump({"a.py": {"total_functions": 2, "functions_with_docstring": 1, "coverage_percent": 50.0},
+                   "overall": {"total_functions": 2, "functions_with_docstring": 1, "coverage_percent": 50.0}}, f)
+
+    snapshot = load_snapshot(path)
+
+    assert snapshot.files == {"a.py": (2, 1)}
+    assert snapshot.functions == {}
+
+
+def test_reordered_classes_are_not_a_regression():
+    before = "class A:\n    def __init__(self):\n        '''Doc.'''\n\nclass B:\n    def __init__(self):\n        pass\n"
+    after = "class B:\n    def __init__(self):\n        pass\n\nclass A:\n    def __init__(self):\n        '''Doc.'''\n"
+
+    old = snapshot_from_results([{"file_path": "m.py", "functions": parse_path(file_content=before)}])
+    new = snapshot_from_results([{"file_path": "m.py", "functions": parse_path(file_content=after)}])
+    diff = diff_snapshots(old, new)
+
+    assert diff["lost_docstrings"] == []
+    assert diff["gained_docstrings"] == []
+    assert not is_regression(diff)
+
+
+def test_load_gzipped_json_report(tmp_path):
+    path = str(tmp_path / "run.json.gz")
+    write_json({"parse_results": _parsed(*OLD[:2]), "validation_results": _validated(OLD[0], OLD[2])}, path)
+
+    with gzip.open(path, "rt") as f:
+        assert "parse_results" in json.load(f)
+    assert load_snapshot(path, root=OLD[0]).functions == _snapshot(*OLD).functions
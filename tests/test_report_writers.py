@@ -0,0 +1,124 @@
+"""
+Tests for streaming report writers and readers
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from core.reporter.coverage_reporter import compute_coverage, write_report
+from core.reporter.report_writers import (
+    NDJSONWriter,
+    SARIFWriter,
+    count_records,
+    coverage_from_records,
+    coverage_records,
+    iter_ndjson,
+    read_slice,
+    validation_violations,
+    write_json,
+    write_sarif,
+)
+from core.validator.validator import validate_file
+
+REPORT = compute_coverage([
+    {"file_path": "a.py", "functions": [{"name": "f", "docstring": "doc"}]},
+    {"file_path": "b.py", "functions": [{"name": "g", "docstring": None}]},
+])
+
+
+@pytest.mark.parametrize("name", ["report.ndjson", "report.ndjson.gz"])
+def test_ndjson_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+
+    write_report(REPORT, path)
+
+    assert coverage_from_records(iter_ndjson(path)) == REPORT
+    assert count_records(path) == 3
+    with open(path, "rb") as f:
+        assert (f.read(2) == b"\x1f\x8b") == name.endswith(".gz")
+
+
+def test_ndjson_slices_and_filters(tmp_path):
+    path = str(tmp_path / "records.ndjson")
+    with NDJSONWriter(path) as writer:
+        writer.write_all({"type": "file", "n": i} for i in range(10))
+        writer.write({"type": "overall"})
+
+    assert [r["n"] for r in read_slice(path, 4, 3)] == [4, 5, 6]
+    assert list(iter_ndjson(path, where=lambda r: r["type"] == "overall")) == [{"type": "overall"}]
+
+
+def test_ndjson_slice_does_not_decode_skipped_lines(tmp_path):
+    path = str(tmp_path / "partial.ndjson")
+    with open(path, "w") as f:
+        f.write("not json\n")
+        f.write('{"ok":true}\n')
+
+    assert read_slice(path, 1, 5) == [{"ok": True}]
+
+
+def test_sarif_log_is_valid_json(tmp_path):
+    path = str(tmp_path / "out" / "report.sarif")
+    results = [
+        {"file": str(tmp_path / "pkg" / "a.py"), "parse_error": False, "formatting_violations": [
+            {"code": "E225", "line": 1, "column": 2, "message": "missing whitespace around operator"},
+        ]},
+        {"file": str(tmp_path / "b.py"), "parse_error": True},
+    ]
+
+    count = write_sarif(validation_violations(results), path, root=str(tmp_path))
+
+    with open(path) as f:
+        log = json.load(f)
+    run = log["runs"][0]
+    assert count == 2
+    assert log["version"] == "2.1.0"
+    assert [r["id"] for r in run["tool"]["driver"]["rules"]] == ["E225", "E999"]
+    location = run["results"][0]["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == "pkg/a.py"
+    assert location["region"] == {"startLine": 1, "startColumn": 2}
+
+
+def test_sarif_log_includes_pep257_violations(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text('"""Module."""\n\n\ndef f():\n    pass\n')
+    path = str(tmp_path / "report.sarif")
+
+    write_sarif(validation_violations([validate_file(str(source))]), path, root=str(tmp_path))
+
+    with open(path) as f:
+        results = json.load(f)["runs"][0]["results"]
+    assert [(r["ruleId"], r["locations"][0]["physicalLocation"]["region"]["startLine"]) for r in results] == [
+        ("D103", 4),
+    ]
+
+
+def test_empty_sarif_log(tmp_path):
+    path = str(tmp_path / "empty.sarif.gz")
+    with SARIFWriter(path):
+        pass
+
+    with gzip.open(path, "rt") as f:
+        log = json.load(f)
+    assert log["runs"][0]["results"] == []
+
+
+def test_compact_json_is_smaller(tmp_path):
+    compact, indented = str(tmp_path / "c.json"), str(tmp_path / "i.json")
+
+    write_json(REPORT, compact)
+    write_report(REPORT, indented)
+
+    with open(compact) as f:
+        assert json.load(f) == REPORT
+    assert os.path.getsize(compact) < os.path.getsize(indented)
+
+
+def test_coverage_records_put_overall_last():
+    records = list(coverage_records(REPORT))
+
+    assert [r["type"] for r in records] == ["file", "file", "overall"]
+    assert records[0]["file_path"] == "a.py"
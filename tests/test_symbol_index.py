@@ -0,0 +1,91 @@
+"""
+Tests for the repository symbol index
+"""
+
+import ast
+
+from core.parser.python_parser import parse_directory
+from core.parser.parse_cache import ParseCache
+from core.parser.symbol_index import SymbolIndex, iter_symbols, module_name
+
+CODE = '''
+class Greeter:
+    """Greets."""
+    def hello(self):
+        def inner():
+            pass
+
+async def fetch():
+    pass
+
+if True:
+    def conditional():
+        pass
+'''
+
+
+def test_iter_symbols_qualified_names():
+    names = [name for name, _ in iter_symbols(ast.parse(CODE))]
+
+    assert names == ["Greeter", "Greeter.hello", "Greeter.hello.inner", "fetch", "conditional"]
+
+
+def test_module_name():
+    assert module_name("/repo/pkg/sub/mod.py", "/repo") == "pkg.sub.mod"
+    assert module_name("/repo/pkg/__init__.py", "/repo") == "pkg"
+    assert module_name("mod.py") == "mod"
+
+
+def test_index_lookup_and_incremental_update():
+    index = SymbolIndex()
+    index.index_tree("pkg/a.py", ast.parse(CODE), "pkg.a")
+    index.index_tree("pkg/b.py", ast.parse("def b(): pass"), "pkg.b")
+
+    entry = index.get("pkg.a.Greeter.hello")
+    assert entry["file_path"] == "pkg/a.py"
+    assert (entry["lineno"], entry["end_lineno"]) == (4, 6)
+    assert index.get("pkg.a.fetch")["kind"] == "async_function"
+    assert index.get("pkg.a.Greeter")["has_docstring"] is True
+
+    index.index_tree("pkg/a.py", ast.parse("def only(): pass"), "pkg.a")
+    assert "pkg.a.Greeter.hello" not in index
+    assert index.names("pkg/a.py") == ["pkg.a.only"]
+    assert "pkg.b.b" in index
+
+
+def test_parse_directory_builds_index(tmp_path):
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "pkg" / "mod.py").write_text(CODE)
+    (src / "top.py").write_text("def top(): pass\n")
+
+    with ParseCache(str(tmp_path / "cache.db")) as cache:
+        index = SymbolIndex()
+        parse_directory(str(src), workers=2, chunksize=1, cache=cache, index=index)
+        assert index.get("pkg.mod.Greeter.hello.inner")["lineno"] == 5
+        assert "top.top" in index
+
+        index.save(str(tmp_path / "index.json"))
+        reloaded = SymbolIndex.load(str(tmp_path / "index.json"))
+        results = parse_directory(str(src), workers=1, cache=cache, index=reloaded)
+
+        assert cache.stats()["hits"] == 2
+        assert "symbols" not in results[0]
+        assert len(reloaded) == len(index)
+
+
+def test_parse_directory_drops_deleted_files(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "kept.py").write_text("def kept(): pass\n")
+    (src / "gone.py").write_text("def old(): pass\n")
+    index = SymbolIndex()
+    index.index_tree("elsewhere/other.py", ast.parse("def other(): pass"), "other")
+
+    parse_directory(str(src), workers=1, index=index)
+    (src / "gone.py").unlink()
+    parse_directory(str(src), workers=1, index=index)
+
+    assert index.get("gone.old") is None
+    assert "kept.kept" in index
+    assert "other.other" in index
@@ -65,7 +65,9 @@ def test_validate_file_formatting_issue():
     path = create_temp_file(code)
 
     result = validate_file(path)
-    assert result["formatting_issues"] in [0, 1]
+    assert result["formatting_issues"] >= 1
+    assert result["formatting_issues"] == len(result["formatting_violations"])
+    assert all(v["line"] == 1 for v in result["formatting_violations"])
 
     os.remove(path)
 
@@ -115,3 +117,129 @@ def test():
     assert len(violations) == 0
 
     os.remove(path)
+
+
+def test_validate_folder_recursive_in_stable_order(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "z.py").write_text("def z(): pass\n")
+    (tmp_path / "pkg" / "a.py").write_text("def a():\n    '''Doc.'''\n")
+    (tmp_path / "pkg" / "b.py").write_text("def b(:\n")
+
+    results = validate_folder(str(tmp_path), recursive=True, workers=2, timeout=30)
+
+    assert [r["file"] for r in results] == [
+        str(tmp_path / "z.py"),
+        str(tmp_path / "pkg" / "a.py"),
+        str(tmp_path / "pkg" / "b.py"),
+    ]
+    assert results[2]["parse_error"] is True
+    # Same results in-process, apart from the per-checker wall times
+    def without_timings(rs):
+        return [{k: v for k, v in r.items() if k != "checkers"} for r in rs]
+    assert without_timings(results) == without_timings(validate_folder(str(tmp_path), recursive=True, workers=1))
+    assert len(validate_folder(str(tmp_path))) == 1
+
+
+def test_validate_file_budget_records_timeout(tmp_path, monkeypatch):
+    import time
+    import core.validator.validator as validator
+
+    path = str(tmp_path / "slow.py")
+    with open(path, "w") as f:
+        f.write("def slow(): pass\n")
+
+    def stuck(file_path, context=None, **kwargs):
+        while True:
+            time.sleep(0.01)
+
+    monkeypatch.setattr(validator, "validate_file", stuck)
+    result = validator._validate_with_budget(path, 0.05)
+
+    assert result["timed_out"] is True
+    assert result["file"] == path
+
+
+def test_undecodable_file_does_not_abort_the_folder(tmp_path):
+    (tmp_path / "latin1.py").write_bytes(b"name = 'caf\xe9'\n")
+    (tmp_path / "ok.py").write_text("def ok(): pass\n")
+
+    results = validate_folder(str(tmp_path), recursive=True, workers=2)
+
+    assert [os.path.basename(r["file"]) for r in results] == ["latin1.py", "ok.py"]
+    assert results[0]["parse_error"] is True and "error" in results[0]
+    assert results[1]["parse_error"] is False
+
+
+def test_formatting_check_stops_at_cap():
+    code = "x=1\ny=2\nz=3\n"
+    path = create_temp_file(code)
+
+    assert validate_file(path)["formatting_issues"] == 3
+    capped = validate_file(path, max_formatting_issues=2)
+    assert capped["formatting_issues"] == 2
+    assert capped["formatting_violations"][0]["code"] == "E225"
+
+    os.remove(path)
+
+
+def test_validate_file_reports_checker_timings():
+    path = create_temp_file("def f():\n    pass\n")
+
+    result = validate_file(path)
+
+    assert set(result["checkers"]) >= {"docstrings", "pep257", "formatting"}
+    assert result["checkers"]["docstrings"]["count"] == 1
+    assert all(c["seconds"] >= 0 for c in result["checkers"].values())
+    assert validate_file(path, concurrent=False)["missing_docstrings"] == 1
+
+    os.remove(path)
+
+
+def test_custom_checker_runs_with_builtins():
+    from core.validator.checkers import CHECKERS, register_checker
+
+    @register_checker("todo_comments", needs=("lines",))
+    def todo_comments(context, options):
+        return [i for i, line in enumerate(context.lines, 1) if "TODO" in line]
+
+    try:
+        path = create_temp_file("x = 1  # TODO\n")
+        result = validate_file(path, checkers=["todo_comments", "formatting"])
+        os.remove(path)
+    finally:
+        del CHECKERS["todo_comments"]
+
+    assert result["extra_checks"] == {"todo_comments": [1]}
+    assert result["checkers"]["todo_comments"]["count"] == 1
+    assert "pep257" not in result["checkers"]
+
+
+def test_checker_errors_and_missing_needs_are_reported():
+    from core.analysis.context import AnalysisContext
+    from core.validator.checkers import CHECKERS, register_checker, run_checkers
+
+    @register_checker("broken", needs=("source",))
+    def broken(context, options):
+        raise RuntimeError("boom")
+
+    try:
+        outcomes = run_checkers(AnalysisContext("def f(:\n"), ["broken", "docstrings"])
+    finally:
+        del CHECKERS["broken"]
+
+    assert outcomes["broken"]["count"] == -1
+    assert outcomes["broken"]["error"] == "boom"
+    assert "ast unavailable" in outcomes["docstrings"]["skipped"]
+
+
+def test_validate_folder_is_serial_by_default(tmp_path, monkeypatch):
+    import core.validator.validator as validator
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(validator, "ProcessPoolExecutor", no_pool)
+    (tmp_path / "a.py").write_text("def a(): pass\n")
+    (tmp_path / "b.py").write_text("def b(): pass\n")
+
+    assert [os.path.basename(r["file"]) for r in validate_folder(str(tmp_path))] == ["a.py", "b.py"]
@@ -0,0 +1,88 @@
+"""
+Tests for watch mode
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+from core.watcher.watcher import Watcher
+
+
+def write(path, code):
+    with open(path, "w") as f:
+        f.write(code)
+
+
+def wait_for_delta(watcher, attempts=20):
+    for _ in range(attempts):
+        delta = watcher.poll(timeout=0.1)
+        if delta is not None:
+            return delta
+    return None
+
+
+@pytest.fixture(params=["polling", "inotify"])
+def backend(request):
+    if request.param == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    return request.param
+
+
+def test_scan_then_only_changed_files(tmp_path, backend):
+    write(tmp_path / "a.py", "def a():\n    pass\n")
+    write(tmp_path / "b.py", "def b():\n    pass\n")
+
+    with Watcher(str(tmp_path), debounce=0.05, poll_interval=0.05, backend=backend) as watcher:
+        initial = watcher.scan()
+        assert sorted(os.path.basename(p) for p in initial["changed"]) == ["a.py", "b.py"]
+
+        write(tmp_path / "a.py", 'def a():\n    """Doc."""\n    pass\n')
+        delta = wait_for_delta(watcher)
+
+    changed = delta["changed"]
+    assert list(changed) == [str(tmp_path / "a.py")]
+    assert changed[str(tmp_path / "a.py")]["functions"][0]["docstring"] == "Doc."
+    assert changed[str(tmp_path / "a.py")]["validation"]["missing_docstrings"] == 0
+    assert delta["removed"] == []
+
+
+def test_removed_files_and_folders(tmp_path, backend):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    write(tmp_path / "a.py", "x = 1\n")
+    write(pkg / "b.py", "y = 2\n")
+
+    with Watcher(str(tmp_path), debounce=0.05, poll_interval=0.05, backend=backend) as watcher:
+        watcher.scan()
+        os.remove(tmp_path / "a.py")
+        shutil.rmtree(pkg)
+        delta = wait_for_delta(watcher)
+
+    assert delta["removed"] == sorted([str(tmp_path / "a.py"), str(pkg / "b.py")])
+    assert watcher.results == {}
+
+
+def test_new_folder_is_picked_up(tmp_path, backend):
+    with Watcher(str(tmp_path), debounce=0.05, poll_interval=0.05, backend=backend) as watcher:
+        watcher.scan()
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        write(sub / "c.py", "def c(:\n")
+        delta = wait_for_delta(watcher)
+
+    result = delta["changed"][str(sub / "c.py")]
+    assert result["functions"] is None
+    assert result["validation"]["parse_error"] is True
+
+
+def test_unchanged_contents_are_not_reanalyzed(tmp_path):
+    write(tmp_path / "a.py", "x = 1\n")
+
+    with Watcher(str(tmp_path), debounce=0.05, poll_interval=0.05, backend="polling") as watcher:
+        watcher.scan()
+        os.utime(tmp_path / "a.py", ns=(1, 1))
+
+        assert watcher.poll(timeout=0.1) is None